@@ -2,12 +2,29 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import filedialog, messagebox, font as tkfont
 import re
+import bisect
 import json
+import array
+import mmap
+import codecs
+import collections
+import csv
+import locale
 import os
 import sys
 from fontTools.ttLib import TTFont
 import subprocess
+import concurrent.futures
+import itertools
+import tempfile
+import hashlib
+import shutil
+import signal
+import stat
+import statistics
 import threading
+import time
+import zlib
 import platform
 import psutil
 
@@ -37,11 +54,21 @@ SETTINGS_FILE = resource_path("settings.json")
 # Default settings
 DEFAULT_SETTINGS = {
     "auto_save": True,
+    "auto_save_delay_ms": 1000,
+    "max_loaded_tabs": 12,
     "font_size": 14,
     "font_family": "Consolas",
     "theme": "dark",
     "cpp_standard": "17",
     "show_compiler_cmd": True,
+    "build_cache": True,
+    "build_cache_mb": 256,
+    "precompiled_headers": True,
+    "speculative_compile": False,
+    "project_mode": False,
+    "syntax_check": True,
+    "syntax_check_delay_ms": 800,
+    "syntax_check_max_jobs": 1,
     "tab_width": 4,
     "highlight_current_line": True,
     "syntax_highlighting": True,
@@ -49,10 +76,26 @@ DEFAULT_SETTINGS = {
     "output_font_size": 13,
     "output_text_color": "#00ff88",
     "output_bg_color": "#111111",
+    "output_max_lines": 10000,
+    "input_mode": "terminal",
+    "input_file": "",
+    "test_compare_mode": "whitespace",
+    "test_float_epsilon": 1e-6,
+    "test_time_limit_s": 10,
+    "run_wall_limit_s": 0,
+    "run_cpu_limit_s": 60,
+    "run_memory_limit_mb": 0,
+    "monitor_interval_ms": 200,
+    "monitor_samples": 1500,
+    "benchmark_runs": 10,
+    "benchmark_warmup": 1,
+    "benchmark_pin_cpu": False,
     "current_syntax_file": "default.json",
     "show_system_fonts": False,
     "use_external_terminal": False,
-    "show_minimap": True
+    "show_minimap": True,
+    "highlight_viewport_first_kb": 512,
+    "highlight_max_kb": 8192
 }
 
 # Global compiler preference
@@ -111,37 +154,83 @@ DEFAULT_FONTS = {"Consolas", "Courier New", "Monospace"}
 loaded_custom_font_names = set()
 
 
-def clean_code_text(text):
-    """
-    Remove problematic invisible Unicode characters that cause compilation errors.
-    Only removes definitively wrong characters, preserves valid special characters.
-    """
+# Problematic invisible Unicode characters that cause compilation errors.
+# Only definitively wrong characters, valid special characters are preserved.
+CLEAN_CODE_MAP = {
     # Non-breaking spaces -> regular space
-    text = text.replace('\u00a0', ' ')  # Non-breaking space
-    text = text.replace('\u202f', ' ')  # Narrow no-break space
-    text = text.replace('\u2007', ' ')  # Figure space
-    text = text.replace('\u2009', ' ')  # Thin space
-    text = text.replace('\u200a', ' ')  # Hair space
-    
+    '\u00a0': ' ',  # Non-breaking space
+    '\u202f': ' ',  # Narrow no-break space
+    '\u2007': ' ',  # Figure space
+    '\u2009': ' ',  # Thin space
+    '\u200a': ' ',  # Hair space
+
     # Zero-width characters -> remove completely
-    text = text.replace('\u200b', '')   # Zero-width space
-    text = text.replace('\u200c', '')   # Zero-width non-joiner
-    text = text.replace('\u200d', '')   # Zero-width joiner
-    text = text.replace('\ufeff', '')   # Zero-width no-break space (BOM)
-    
+    '\u200b': '',   # Zero-width space
+    '\u200c': '',   # Zero-width non-joiner
+    '\u200d': '',   # Zero-width joiner
+    '\ufeff': '',   # Zero-width no-break space (BOM)
+
     # Right-to-left and left-to-right marks -> remove
-    text = text.replace('\u200e', '')   # Left-to-right mark
-    text = text.replace('\u200f', '')   # Right-to-left mark
-    text = text.replace('\u202a', '')   # Left-to-right embedding
-    text = text.replace('\u202b', '')   # Right-to-left embedding
-    text = text.replace('\u202c', '')   # Pop directional formatting
-    text = text.replace('\u202d', '')   # Left-to-right override
-    text = text.replace('\u202e', '')   # Right-to-left override
-    
+    '\u200e': '',   # Left-to-right mark
+    '\u200f': '',   # Right-to-left mark
+    '\u202a': '',   # Left-to-right embedding
+    '\u202b': '',   # Right-to-left embedding
+    '\u202c': '',   # Pop directional formatting
+    '\u202d': '',   # Left-to-right override
+    '\u202e': '',   # Right-to-left override
+
     # Soft hyphen -> remove
-    text = text.replace('\u00ad', '')   # Soft hyphen
-    
-    return text
+    '\u00ad': '',   # Soft hyphen
+}
+CLEAN_CODE_TABLE = str.maketrans(CLEAN_CODE_MAP)
+CLEAN_CODE_RE = re.compile("[" + "".join(CLEAN_CODE_MAP) + "]")
+
+
+def clean_code_text(text):
+    """
+    Remove problematic invisible Unicode characters in a single pass.
+    Returns (cleaned_text, changes) where changes is a list of
+    (offset, replacement) pairs with offsets into the original text.
+    """
+    changes = [(m.start(), CLEAN_CODE_MAP[m.group()]) for m in CLEAN_CODE_RE.finditer(text)]
+    if not changes:
+        return text, changes
+    return text.translate(CLEAN_CODE_TABLE), changes
+
+
+def patch_editor_text(text, changes):
+    """Apply clean_code_text() changes to the editor in place, keeping cursor, view and tags"""
+    line_starts = build_line_table(text)
+    code_editor.edit_separator()
+    # Back to front, so earlier offsets stay valid
+    for offset, replacement in reversed(changes):
+        index = offset_to_index(line_starts, offset)
+        if replacement:
+            code_editor.replace(index, f"{index}+1c", replacement)
+        else:
+            code_editor.delete(index)
+    code_editor.edit_separator()
+    schedule_highlight(0)
+
+
+def write_file_atomic(path, text):
+    """Write through a temp file + fsync + rename so a crash never leaves a half-written file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".runpp-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
 
 
 def get_font_family_name(ttf_path):
@@ -229,9 +318,21 @@ tab_bar.grid(row=0, column=0, sticky="ew", padx=5, pady=(5, 0))
 tab_bar.grid_columnconfigure(999, weight=1)
 
 tabs = {}
+tab_order = []   # tab ids in tab bar order
+tab_lru = {}     # tab ids, least recently used first
 active_tab = None
 previous_active_tab = None
 tab_counter = 1
+editor_state_owner = None   # tab whose editor state is live in the globals
+
+# Status line under the editor (auto-save results etc.)
+editor_status = ctk.CTkLabel(editor_frame, text="", height=18, font=("Arial", 11), text_color="gray", anchor="w")
+editor_status.grid(row=2, column=0, sticky="ew", padx=12, pady=(0, 4))
+
+
+def set_editor_status(text):
+    editor_status.configure(text=text)
+
 
 # Line number & editor setup
 text_frame = ctk.CTkFrame(editor_frame)
@@ -248,21 +349,59 @@ line_numbers = tk.Canvas(
 )
 line_numbers.grid(row=0, column=0, sticky="ns")
 
-# Code Editor
-code_editor = tk.Text(
-    text_frame,
-    bg="#1e1e1e",
-    fg="#dcdcdc",
-    insertbackground="white",
-    font=code_editor_font,
-    undo=True,
-    wrap="none",
-    tabs=settings["tab_width"] * 8
-)
-code_editor.grid(row=0, column=1, sticky="nsew")
+# Code Editor: one Text widget per tab (see create_code_editor), so each keeps
+# its own tags, undo stack and view and switching tabs is just a grid swap
+code_editor = None
+
+
+def create_code_editor():
+    editor = tk.Text(
+        text_frame,
+        bg="#1e1e1e",
+        fg="#dcdcdc",
+        insertbackground="white",
+        font=code_editor_font,
+        undo=True,
+        wrap="none",
+        tabs=settings["tab_width"] * 8
+    )
+
+    def on_editor_scroll(*args):
+        if editor is code_editor:
+            on_scroll(*args)
+
+    editor.configure(yscrollcommand=on_editor_scroll)
+    editor.tag_configure("current_line", background="#2a2a2a")
+    editor.tag_configure("check_error", underline=True)
+    editor.tag_configure("check_warning", underline=True)
+    try:
+        editor.tag_configure("check_error", underlinefg=DIAGNOSTIC_COLORS["error"])
+        editor.tag_configure("check_warning", underlinefg=DIAGNOSTIC_COLORS["warning"])
+    except tk.TclError:
+        pass   # Tk older than 8.6.6 has no underline colour
+    editor.bind("<KeyRelease>", on_edit)
+    editor.bind("<MouseWheel>", schedule_view_update)
+    editor.bind("<Button-4>", schedule_view_update)
+    editor.bind("<Button-5>", schedule_view_update)
+    editor.bind("<Button-1>", lambda e: editor.after(1, highlight_current_line))
+    editor.bind("<ButtonRelease-1>", lambda e: (highlight_current_line(), show_check_message()))
+    install_editor_proxy(editor)
+    configure_highlight_tags(editor)
+    return editor
+
+
+def destroy_code_editor(editor):
+    editor.destroy()
+    # The proxy proc and command installed under the widget's name outlive the widget
+    try:
+        app.tk.call("rename", editor._w, "")
+        app.tk.deletecommand(editor._w + "_proxy")
+    except tk.TclError:
+        pass
+
 
 # Scrollbar
-scrollbar = ctk.CTkScrollbar(text_frame, command=code_editor.yview)
+scrollbar = ctk.CTkScrollbar(text_frame)
 scrollbar.grid(row=0, column=2, sticky="ns")
 
 try:
@@ -282,127 +421,217 @@ if settings.get("show_minimap", True):
 
 def on_scroll(*args):
     scrollbar.set(*args)
-    update_line_numbers()
-    update_minimap()
+    schedule_view_update()
+    if hl_pending:
+        # Scrolled into lines that are not highlighted yet: fill them in first
+        schedule_highlight(30)
 
 
-code_editor.configure(yscrollcommand=on_scroll)
+# Line number gutter: a pool of canvas text items reused across redraws
+DIAGNOSTIC_COLORS = {"error": "#ff5555", "warning": "#f1fa8c", "note": "#8be9fd"}
+gutter_items = []
+gutter_key = None   # what the gutter was last drawn for
+view_update_pending = False
+
 
-# Update line numbers
 def update_line_numbers(event=None):
-    line_numbers.delete("all")
-    
+    global gutter_key
     first_visible = code_editor.index("@0,0")
-    line_num = int(first_visible.split('.')[0])
+    dline = code_editor.dlineinfo(first_visible)
+    total_lines = editor_line_count()
+    y_offset = dline[1] if dline is not None else None
+    key = (first_visible, y_offset, code_editor.winfo_height(), total_lines, code_editor_font, diagnostic_version)
+    if key == gutter_key:
+        return
+    gutter_key = key
+
+    rows = []
+    if dline is not None:
+        line_num = int(first_visible.split('.')[0])
+        y, line_height = dline[1], max(1, dline[3])
+        while line_num <= total_lines and y < code_editor.winfo_height():
+            rows.append((line_num, y + line_height // 2))
+            line_num += 1
+            y += line_height
+
+    # Lines with compiler errors/warnings are marked by colouring their number
+    marks = active_diagnostic_marks()
+    for k, (line_num, y) in enumerate(rows):
+        fill = DIAGNOSTIC_COLORS.get(marks.get(line_num), "#666666")
+        if k < len(gutter_items):
+            item = gutter_items[k]
+            line_numbers.coords(item, 40, y)
+            line_numbers.itemconfigure(item, text=str(line_num), font=code_editor_font, fill=fill, state="normal")
+        else:
+            gutter_items.append(line_numbers.create_text(
+                40, y, anchor="e", text=str(line_num), fill=fill, font=code_editor_font
+            ))
+    for item in gutter_items[len(rows):]:
+        line_numbers.itemconfigure(item, state="hidden")
 
-    i = code_editor.index("@0,0")
-    while True:
-        dline = code_editor.dlineinfo(i)
-        if dline is None:
-            break
-        y = dline[1] + dline[3] // 2
-        linenum_str = str(line_num)
-        line_numbers.create_text(40, y, anchor="e", text=linenum_str, fill="#666666", font=code_editor_font)
-        i = code_editor.index(f"{i}+1line")
-        line_num += 1
+
+def schedule_view_update(event=None):
+    """Coalesce gutter/minimap refresh requests into one per idle cycle"""
+    global view_update_pending
+    if view_update_pending:
+        return
+    view_update_pending = True
+    app.after_idle(flush_view_update)
+
+
+def flush_view_update():
+    global view_update_pending
+    view_update_pending = False
+    if code_editor is None:
+        return
+    update_line_numbers()
+    update_minimap()
+
+
+
+MINIMAP_BLOCK_HEIGHT = 2  # pixels (increase to 3 or 4 for chunkier look)
+MINIMAP_BG = "#0a0a0a"
+
+minimap_lines = []     # cached (color, content_length) for every editor line
+minimap_dirty = None   # [first_line, last_line] whose classification is stale
+minimap_image = None   # PhotoImage the code blocks are rendered into
+minimap_layout = None  # (width, height, total_lines, group_size) of the rendered image
+
+
+def classify_minimap_line(line):
+    """Color logic for one minimap block"""
+    color = "#333333"  # default
+    if '//' in line or '/*' in line or '*/' in line:
+        color = "#4a7a4a"  # Comments
+    elif any(kw in line for kw in ['#include', '#define', '#pragma']):
+        color = "#7a4a7a"  # Preprocessor
+    elif any(kw in line for kw in ['if', 'else', 'for', 'while', 'switch', 'case']):
+        color = "#4a6a9a"  # Control flow
+    elif any(kw in line for kw in ['class', 'struct', 'int', 'void', 'return']):
+        color = "#7a7a4a"  # Keywords
+    return color, len(line.strip())
+
+
+def note_minimap_edit(line, delta):
+    """Keep the classification cache aligned after an edit at `line` that added `delta` lines"""
+    global minimap_dirty
+    if delta > 0:
+        minimap_lines[line:line] = [None] * delta
+    elif delta < 0:
+        del minimap_lines[line:line - delta]
+    last = line + max(delta, 0)
+    if minimap_dirty is None:
+        minimap_dirty = [line, last]
+    else:
+        minimap_dirty = [min(minimap_dirty[0], line), max(minimap_dirty[1], last)]
+
+
+def draw_minimap_row(row, line_index, width):
+    y = row * MINIMAP_BLOCK_HEIGHT
+    minimap_image.put(MINIMAP_BG, to=(0, y, width, y + MINIMAP_BLOCK_HEIGHT))
+    color, content_length = minimap_lines[line_index]
+    # Width based on content length
+    block_width = int(min(width - 4, content_length * 1.2))
+    if block_width > 0:
+        minimap_image.put(color, to=(2, y, 2 + block_width, y + MINIMAP_BLOCK_HEIGHT))
 
 
 def update_minimap(event=None):
-    """Update the code minimap with fixed-height blocks"""
+    """Update the code minimap, re-rendering only rows whose lines changed"""
+    global minimap_lines, minimap_dirty, minimap_image, minimap_layout
     if not settings.get("show_minimap", True):
         return
 
-    minimap.delete("all")
-
     try:
-        text = code_editor.get("1.0", "end-1c")
-        lines = text.split('\n')
-        total_lines = len(lines)
-        
-        if total_lines == 0:
-            return
-
+        total_lines = editor_line_count()
         canvas_height = minimap.winfo_height()
         canvas_width = minimap.winfo_width()
-        
-        if canvas_height <= 1:
+
+        if canvas_height <= 1 or canvas_width <= 1:
             return
-        
-        block_height = 2  # pixels (increase to 3 or 4 for chunkier look)
-        
+
+        if len(minimap_lines) != total_lines:
+            minimap_lines = [None] * total_lines
+            minimap_dirty = [1, total_lines]
+
+        dirty = minimap_dirty
+        if dirty is not None:
+            first = max(1, dirty[0])
+            last = min(total_lines, dirty[1])
+            if first <= last:
+                lines = code_editor.get(f"{first}.0", f"{last}.end").split('\n')
+                for offset, line in enumerate(lines):
+                    minimap_lines[first - 1 + offset] = classify_minimap_line(line)
+            minimap_dirty = None
+
         # Calculate how many lines we can fit (with possible gap)
-        max_visible_blocks = canvas_height // block_height
+        max_visible_blocks = canvas_height // MINIMAP_BLOCK_HEIGHT
         # If too many lines, we'll skip some
         if total_lines > max_visible_blocks * 2:
             # Simple downsampling: group lines into blocks
             group_size = max(1, total_lines // max_visible_blocks)
         else:
             group_size = 1
-
-        y = 0
-        for i in range(0, total_lines, group_size):
-            # Take representative line (first in group)
-            line = lines[i] if i < total_lines else ""
-            
-            # Color logic
-            color = "#333333"  # default
-            if '//' in line or '/*' in line or '*/' in line:
-                color = "#4a7a4a"  # Comments
-            elif any(kw in line for kw in ['#include', '#define', '#pragma']):
-                color = "#7a4a7a"  # Preprocessor
-            elif any(kw in line for kw in ['if', 'else', 'for', 'while', 'switch', 'case']):
-                color = "#4a6a9a"  # Control flow
-            elif any(kw in line for kw in ['class', 'struct', 'int', 'void', 'return']):
-                color = "#7a7a4a"  # Keywords
-
-            # Width based on content length
-            content_length = len(line.strip())
-            block_width = min(canvas_width - 4, content_length * 1.2)  # slightly wider than before
-
-            # Draw rectangle (fixed height)
-            minimap.create_rectangle(
-                2, y, 2 + block_width, y + block_height,
-                fill=color,
-                outline="",  # no border for cleaner look
-                tags="codeblock"
-            )
-            y += block_height
-
-            if y >= canvas_height:
-                break
-
-        # Draw viewport indicator (overlay)
-        first_visible = code_editor.index("@0,0")
-        last_visible = code_editor.index("@0,%d" % code_editor.winfo_height())
-        
-        first_line = int(first_visible.split('.')[0]) - 1
-        last_line = int(last_visible.split('.')[0]) - 1
-        
-        # Map editor lines to minimap y
-        if total_lines > 0:
-            y_scale = y / total_lines  # approximate
-            viewport_y1 = first_line * y_scale
-            viewport_y2 = last_line * y_scale
-            minimap.create_rectangle(
-                0, viewport_y1, canvas_width, viewport_y2,
-                outline="#ffffff",
-                width=1,
-                fill="",
-                tags="viewport"
-            )
+        rows = min((total_lines + group_size - 1) // group_size, max_visible_blocks)
+
+        layout = (canvas_width, canvas_height, total_lines, group_size)
+        if minimap_image is None or layout[:2] != (minimap_image.width(), minimap_image.height()):
+            minimap_image = tk.PhotoImage(width=canvas_width, height=canvas_height)
+            minimap.delete("codeblock")
+            minimap.create_image(0, 0, anchor="nw", image=minimap_image, tags="codeblock")
+            minimap.tag_lower("codeblock")
+            minimap_layout = None
+
+        if layout != minimap_layout:
+            # Geometry or line count changed: redraw every row from the cache
+            minimap_image.put(MINIMAP_BG, to=(0, 0, canvas_width, canvas_height))
+            for row in range(rows):
+                draw_minimap_row(row, row * group_size, canvas_width)
+            minimap_layout = layout
+        elif dirty is not None:
+            first_row = (max(1, dirty[0]) - 1 + group_size - 1) // group_size
+            last_row = min(rows - 1, (min(total_lines, dirty[1]) - 1) // group_size)
+            for row in range(first_row, last_row + 1):
+                draw_minimap_row(row, row * group_size, canvas_width)
+
+        update_minimap_viewport(rows * MINIMAP_BLOCK_HEIGHT, total_lines)
 
     except Exception:
         pass
 
 
+def update_minimap_viewport(drawn_height, total_lines):
+    """Move the viewport indicator (overlay) without touching the code blocks"""
+    first_visible = code_editor.index("@0,0")
+    last_visible = code_editor.index("@0,%d" % code_editor.winfo_height())
+
+    first_line = int(first_visible.split('.')[0]) - 1
+    last_line = int(last_visible.split('.')[0]) - 1
+
+    # Map editor lines to minimap y
+    y_scale = drawn_height / total_lines  # approximate
+    viewport_y1 = first_line * y_scale
+    viewport_y2 = last_line * y_scale
+    canvas_width = minimap.winfo_width()
+    if not minimap.find_withtag("viewport"):
+        minimap.create_rectangle(
+            0, viewport_y1, canvas_width, viewport_y2,
+            outline="#ffffff",
+            width=1,
+            fill="",
+            tags="viewport"
+        )
+    else:
+        minimap.coords("viewport", 0, viewport_y1, canvas_width, viewport_y2)
+
+
 def on_minimap_click(event):
     """Handle clicking on minimap to scroll"""
     if not settings.get("show_minimap", True):
         return
     
     try:
-        text = code_editor.get("1.0", "end-1c")
-        total_lines = len(text.split('\n'))
+        total_lines = editor_line_count()
         canvas_height = minimap.winfo_height()
         
         if canvas_height <= 1 or total_lines == 0:
@@ -422,62 +651,348 @@ def on_minimap_click(event):
 minimap.bind("<Button-1>", on_minimap_click)
 minimap.bind("<B1-Motion>", on_minimap_click)
 
-# Bind events to update line numbers and minimap
-code_editor.bind("<KeyRelease>", lambda e: code_editor.after_idle(lambda: [update_line_numbers(), update_minimap()]))
-code_editor.bind("<MouseWheel>", lambda e: code_editor.after_idle(lambda: [update_line_numbers(), update_minimap()]))
-code_editor.bind("<Button-4>", lambda e: code_editor.after_idle(lambda: [update_line_numbers(), update_minimap()]))
-code_editor.bind("<Button-5>", lambda e: code_editor.after_idle(lambda: [update_line_numbers(), update_minimap()]))
-text_frame.bind("<Configure>", lambda e: code_editor.after_idle(lambda: [update_line_numbers(), update_minimap()]))
+# Bind events to update line numbers and minimap (editor bindings live in create_code_editor)
+text_frame.bind("<Configure>", schedule_view_update)
 
 # Bind scrollbar drag
 def on_scrollbar_command(*args):
     code_editor.yview(*args)
-    code_editor.after_idle(lambda: [update_line_numbers(), update_minimap()])
+    schedule_view_update()
 
 
 scrollbar.configure(command=on_scrollbar_command)
 
 # Initial update
 def initial_line_number_update():
-    update_line_numbers()
-    update_minimap()
-    app.after(50, lambda: [update_line_numbers(), update_minimap()])
-    app.after(150, lambda: [update_line_numbers(), update_minimap()])
-    app.after(300, lambda: [update_line_numbers(), update_minimap()])
+    schedule_view_update()
+    # Geometry may still be settling right after startup
+    app.after(150, schedule_view_update)
 
 
 app.after(100, initial_line_number_update)
 
-code_editor.tag_configure("current_line", background="#2a2a2a")
-
 # Global process
 process = None
 
 
+def get_tab_content(tab):
+    """Materialise a tab's text from its editor widget, or its store if evicted"""
+    if tab["editor"] is None:
+        return read_stored_text(tab)
+    return tab["editor"].get("1.0", "end-1c")
+
+
+def update_tab_title(tab):
+    title = tab_title(tab)
+    for slot in tab_slots:
+        if slot["tab_id"] == tab["id"] and slot["title"] != title:
+            slot["button"].configure(text=title)
+            slot["title"] = title
+
+
+def mark_tab_saved(tab, text):
+    """Remember the saved snapshot as length + hash instead of a second copy"""
+    tab["saved_len"] = len(text)
+    tab["saved_hash"] = hash(text)
+    tab["modified"] = False
+    if tab["editor"] is not None:
+        tab["editor"].edit_modified(False)
+    if tab["id"] == active_tab:
+        tab["generation"] = edit_generation
+    update_tab_title(tab)
+
+
+def refresh_tab_modified(tab):
+    """Recompute the active tab's dirty flag from Tk's modified flag"""
+    tab["generation"] = edit_generation
+    modified = bool(code_editor.edit_modified())
+    if modified and editor_char_count() == tab["saved_len"]:
+        # Same length as the saved file: only then is the full text worth hashing
+        modified = hash(code_editor.get("1.0", "end-1c")) != tab["saved_hash"]
+        if not modified:
+            code_editor.edit_modified(False)
+    tab["modified"] = modified
+    update_tab_title(tab)
+
+
+def is_tab_modified(tab):
+    if tab["id"] == active_tab and tab["generation"] != edit_generation:
+        refresh_tab_modified(tab)
+    return tab["modified"]
+
+
+def save_editor_state(tab):
+    """Park the highlighter/minimap bookkeeping of the outgoing tab"""
+    tab["state"] = {
+        "line_states": line_states,
+        "hl_dirty": hl_dirty,
+        "hl_pending": hl_pending,
+        "hl_disabled": hl_disabled,
+        "hl_viewport_first": hl_viewport_first,
+        "minimap_lines": minimap_lines,
+        "minimap_dirty": minimap_dirty,
+    }
+
+
+def restore_editor_state(tab):
+    global line_states, hl_dirty, hl_pending, hl_disabled, hl_viewport_first, hl_job, highlight_epoch
+    global minimap_lines, minimap_dirty, minimap_layout, gutter_key, editor_state_owner
+    state = tab["state"] or {}
+    line_states = state.get("line_states", [])
+    hl_dirty = state.get("hl_dirty")
+    hl_pending = state.get("hl_pending", [])
+    hl_disabled = state.get("hl_disabled", False)
+    hl_viewport_first = state.get("hl_viewport_first", False)
+    minimap_lines = state.get("minimap_lines", [])
+    minimap_dirty = state.get("minimap_dirty")
+    tab["state"] = None
+    # A job still running belongs to the previous tab's widget
+    hl_job = None
+    highlight_epoch += 1
+    minimap_layout = None
+    gutter_key = None
+    editor_state_owner = tab["id"]
+
+
+# Tab store: only the most recently used tabs keep a live editor widget.
+# Unmodified file tabs are dropped back to their path, other text is packed
+# with zlib (and spilled to a temp file when large) until shown again.
+TAB_SPILL_BYTES = 256 * 1024
+
+
+def touch_tab(tab_id):
+    """Move a tab to the most-recently-used end of tab_lru"""
+    tab_lru.pop(tab_id, None)
+    tab_lru[tab_id] = True
+
+
+def enforce_tab_budget():
+    budget = max(1, int(settings.get("max_loaded_tabs", 12)))
+    loaded = [tid for tid in tab_lru if tabs[tid]["editor"] is not None]
+    excess = len(loaded) - budget
+    for tid in loaded:
+        if excess <= 0:
+            break
+        if tid != active_tab:
+            evict_tab(tabs[tid])
+            excess -= 1
+
+
+def evict_tab(tab):
+    if tab["path"] and not tab["modified"]:
+        # Identical to the file on disk: reload from there when shown again
+        tab["stored"] = ("disk", None)
+    else:
+        data = zlib.compress(tab["editor"].get("1.0", "end-1c").encode("utf-8"))
+        tab["stored"] = ("packed", data)
+        if len(data) > TAB_SPILL_BYTES:
+            try:
+                fd, spill_path = tempfile.mkstemp(prefix="runpp_tab_", suffix=".z")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                tab["stored"] = ("spill", spill_path)
+            except OSError:
+                pass
+    destroy_code_editor(tab["editor"])
+    tab["editor"] = None
+    tab["state"] = None
+
+
+def read_stored_text(tab):
+    kind, data = tab["stored"]
+    if kind == "disk":
+        with open(tab["path"], "r", encoding="utf-8") as f:
+            return f.read()
+    if kind == "spill":
+        with open(data, "rb") as f:
+            data = f.read()
+    return zlib.decompress(data).decode("utf-8")
+
+
+def discard_stored_text(tab):
+    stored = tab.get("stored")
+    tab["stored"] = None
+    if stored and stored[0] == "spill":
+        try:
+            os.remove(stored[1])
+        except OSError:
+            pass
+
+
+def load_tab(tab):
+    """Give an evicted tab a fresh editor holding its stored text"""
+    try:
+        text = read_stored_text(tab)
+    except (OSError, UnicodeDecodeError, zlib.error) as e:
+        messagebox.showerror("Open Failed", f"Could not reload {tab['display']}:\n{e}")
+        text = ""
+    if tab["stored"][0] == "disk":
+        tab["saved_len"] = len(text)
+        tab["saved_hash"] = hash(text)
+    discard_stored_text(tab)
+    editor = create_code_editor()
+    editor.insert("1.0", text)
+    editor.edit_reset()
+    editor.edit_modified(tab["modified"])
+    tab["editor"] = editor
+    tab["rehighlight"] = True
+
+
+# Virtual tab bar: a few button slots show a window onto tab_order
+TAB_SLOT_WIDTH = 180
+TAB_BAR_RESERVED = 120   # room for the scroll and "+" buttons
+tab_slots = []
+tab_bar_offset = 0
+tab_bar_width = None
+
+
+def tab_title(tab):
+    return tab["display"] + "*" if tab["modified"] else tab["display"]
+
+
+def create_tab_slot(column):
+    frame = ctk.CTkFrame(tab_bar, fg_color="transparent")
+    slot = {"frame": frame, "column": column, "tab_id": None, "title": None, "active": None}
+
+    def on_click():
+        if slot["tab_id"] in tabs:
+            switch_tab(slot["tab_id"])
+
+    def on_close():
+        if slot["tab_id"] in tabs:
+            switch_tab(slot["tab_id"])
+            close_current_tab()
+
+    slot["button"] = ctk.CTkButton(
+        frame,
+        text="",
+        height=28,
+        fg_color="#1f1f1f",
+        hover_color="#333333",
+        corner_radius=5,
+        command=on_click
+    )
+    slot["button"].grid(row=0, column=0)
+    slot["close"] = ctk.CTkButton(
+        frame,
+        text="×",
+        width=28,
+        height=28,
+        fg_color="transparent",
+        hover_color="#aa3333",
+        command=on_close
+    )
+    return slot
+
+
+def render_tab_bar(follow_active=False):
+    global tab_bar_offset
+    count = max(1, (tab_bar.winfo_width() - TAB_BAR_RESERVED) // TAB_SLOT_WIDTH)
+    if follow_active and active_tab in tabs:
+        index = tab_order.index(active_tab)
+        if index < tab_bar_offset:
+            tab_bar_offset = index
+        elif index >= tab_bar_offset + count:
+            tab_bar_offset = index - count + 1
+    tab_bar_offset = max(0, min(tab_bar_offset, len(tab_order) - count))
+    visible = tab_order[tab_bar_offset:tab_bar_offset + count]
+    while len(tab_slots) < len(visible):
+        tab_slots.append(create_tab_slot(len(tab_slots)))
+
+    for i, slot in enumerate(tab_slots):
+        if i >= len(visible):
+            if slot["tab_id"] is not None:
+                slot["frame"].grid_remove()
+                slot["tab_id"] = None
+            continue
+        tab = tabs[visible[i]]
+        if slot["tab_id"] is None:
+            slot["frame"].grid(row=0, column=slot["column"], padx=(0, 4))
+        slot["tab_id"] = tab["id"]
+        title = tab_title(tab)
+        if slot["title"] != title:
+            slot["button"].configure(text=title)
+            slot["title"] = title
+        is_active = (tab["id"] == active_tab)
+        if slot["active"] != is_active:
+            slot["button"].configure(fg_color="#2b2b2b" if is_active else "#1f1f1f")
+            if is_active:
+                slot["close"].grid(row=0, column=1, padx=(5, 0))
+            else:
+                slot["close"].grid_forget()
+            slot["active"] = is_active
+
+    if len(tab_order) > count:
+        tab_prev_btn.grid(row=0, column=996, padx=(5, 0))
+        tab_next_btn.grid(row=0, column=997)
+    else:
+        tab_prev_btn.grid_remove()
+        tab_next_btn.grid_remove()
+
+
+def scroll_tab_bar(step):
+    global tab_bar_offset
+    tab_bar_offset += step
+    render_tab_bar()
+
+
+def on_tab_bar_configure(event):
+    global tab_bar_width
+    if event.width != tab_bar_width:
+        tab_bar_width = event.width
+        render_tab_bar(follow_active=True)
+
+
+tab_prev_btn = ctk.CTkButton(
+    tab_bar, text="‹", width=24, height=28, fg_color="#1f1f1f", hover_color="#333333",
+    command=lambda: scroll_tab_bar(-1)
+)
+tab_next_btn = ctk.CTkButton(
+    tab_bar, text="›", width=24, height=28, fg_color="#1f1f1f", hover_color="#333333",
+    command=lambda: scroll_tab_bar(1)
+)
+tab_bar.bind("<Configure>", on_tab_bar_configure)
+
+
 def switch_tab(tab_id):
-    global active_tab, previous_active_tab
+    global active_tab, previous_active_tab, code_editor
     if active_tab is not None and active_tab != tab_id:
         previous_active_tab = active_tab
+        if active_tab in tabs:
+            flush_auto_save(tabs[active_tab])
+            is_tab_modified(tabs[active_tab])
     active_tab = tab_id
-    for tid, tab_data in tabs.items():
-        is_active = (tid == tab_id)
-        tab_data["button"].configure(fg_color="#2b2b2b" if is_active else "#1f1f1f")
-        if is_active:
-            tab_data["close"].grid(row=0, column=1, padx=(5, 0))
-        else:
-            tab_data["close"].grid_forget()
-    code_editor.delete("1.0", "end")
-    code_editor.insert("1.0", tabs[tab_id]["content"])
-    highlight_code()
-    update_line_numbers()
-    update_minimap()
+    touch_tab(tab_id)
+    render_tab_bar(follow_active=True)
+    tab = tabs[tab_id]
+    if code_editor is tab["editor"]:
+        return
+    if tab["editor"] is None:
+        load_tab(tab)
+    if editor_state_owner in tabs:
+        save_editor_state(tabs[editor_state_owner])
+        code_editor.grid_remove()
+    code_editor = tab["editor"]
+    code_editor.grid(row=0, column=1, sticky="nsew")
+    restore_editor_state(tab)
+    scrollbar.set(*code_editor.yview())
+    if tab["rehighlight"]:
+        tab["rehighlight"] = False
+        highlight_code()
+    elif hl_dirty is not None or hl_pending:
+        schedule_highlight(0)
+    highlight_current_line()
+    schedule_view_update()
+    code_editor.focus_set()
+    enforce_tab_budget()
 
 
 def close_tab(tab_id):
     tab = tabs.get(tab_id)
     if not tab:
         return False
-    if tab["content"] != tab["saved_content"]:
+    flush_auto_save(tab, wait=True)
+    if is_tab_modified(tab):
         response = messagebox.askyesnocancel(
             "Unsaved Changes",
             f"Save changes to {tab['display'].rstrip('*')} before closing?"
@@ -487,8 +1002,15 @@ def close_tab(tab_id):
         if response:
             if not save_current_tab():
                 return False
-    tab["frame"].destroy()
+    if tab["editor"] is not None:
+        destroy_code_editor(tab["editor"])
+    discard_stored_text(tab)
+    cancel_speculative_build(tab_id)
+    cancel_syntax_check(tab_id)
     del tabs[tab_id]
+    tab_order.remove(tab_id)
+    tab_lru.pop(tab_id, None)
+    render_tab_bar()
     return True
 
 
@@ -523,41 +1045,32 @@ def new_tab(path=None):
     else:
         content = ""
         display_name = f"untitled{tab_counter-1}.cpp"
-    frame = ctk.CTkFrame(tab_bar, fg_color="transparent")
-    frame.grid(row=0, column=len(tabs), padx=(0, 4))
-    btn = ctk.CTkButton(
-        frame,
-        text=display_name,
-        height=28,
-        fg_color="#1f1f1f",
-        hover_color="#333333",
-        corner_radius=5,
-        command=lambda tid=tab_id: switch_tab(tid)
-    )
-    btn.grid(row=0, column=0)
-    close_btn = ctk.CTkButton(
-        frame,
-        text="×",
-        width=28,
-        height=28,
-        fg_color="transparent",
-        hover_color="#aa3333",
-        command=lambda tid=tab_id: (
-            switch_tab(tid),
-            close_current_tab()
-        )
-    )
     tabs[tab_id] = {
         "id": tab_id,
         "display": display_name,
-        "frame": frame,
-        "button": btn,
-        "close": close_btn,
-        "content": content,
-        "saved_content": content,
+        "editor": create_code_editor(),
+        "stored": None,
+        "state": None,
+        "rehighlight": False,
+        "check_marks": {},
+        "check_messages": {},
+        "saved_len": len(content),
+        "saved_hash": hash(content),
+        "modified": False,
+        "generation": edit_generation,
+        "disk_hash": None,
+        "auto_save_after": None,
+        "auto_save_job": None,
+        "auto_save_lock": threading.Lock(),
         "path": path
     }
+    tab_order.append(tab_id)
     switch_tab(tab_id)
+    if content:
+        code_editor.insert("1.0", content)
+        code_editor.edit_reset()
+        code_editor.edit_modified(False)
+        highlight_code()
 
 
 add_btn = ctk.CTkButton(
@@ -581,189 +1094,534 @@ def highlight_current_line(event=None):
 
 
 def on_edit(event=None):
-    global highlight_after_id
     if active_tab:
-        current = code_editor.get("1.0", "end-1c")
         tab = tabs[active_tab]
-        tab["content"] = current
-        title = tab["button"].cget("text")
-        display_base = tab["display"]
-        if current != tab["saved_content"]:
-            if not title.endswith("*"):
-                tab["button"].configure(text=display_base + "*")
-        else:
-            if title.endswith("*"):
-                tab["button"].configure(text=display_base)
-        if highlight_after_id:
-            code_editor.after_cancel(highlight_after_id)
-        highlight_after_id = code_editor.after(120, highlight_code)
-        if settings.get("auto_save") and tab["path"]:
-            save_current_tab()
+        if tab["generation"] != edit_generation:
+            # The buffer changed since the last check (arrow keys etc. don't count)
+            refresh_tab_modified(tab)
+            schedule_highlight()
+            if settings.get("auto_save") and tab["path"]:
+                schedule_auto_save(tab)
+            schedule_syntax_check(tab)
         highlight_current_line()
-        update_line_numbers()
-        update_minimap()
+        show_check_message()
+        schedule_view_update()
+
+
+# Offset -> "line.col" mapping, so regex offsets never become "1.0 + N chars"
+def build_line_table(text):
+    """Return the offset of the first character of every line in `text`"""
+    line_starts = [0]
+    pos = text.find('\n')
+    while pos != -1:
+        line_starts.append(pos + 1)
+        pos = text.find('\n', pos + 1)
+    return line_starts
+
+
+def offset_to_index(line_starts, offset, first_line=1):
+    """Map an offset into the text behind `line_starts` to a Tk "line.col" index"""
+    line = bisect.bisect_right(line_starts, offset) - 1
+    return f"{first_line + line}.{offset - line_starts[line]}"
+
+
+# Per-line lexer end states, used to resume highlighting mid-document
+STATE_NORMAL = 0
+STATE_BLOCK_COMMENT = 1
+STATE_STRING = 2
+
+STRING_TAIL_RE = re.compile(r'(?:[^"\\]|\\.)*(?P<string_end>"|\\$|$)')
+
+# Master alternation: strings and comments are alternatives of the same scan,
+# so keywords and numbers inside them can never match
+TOKEN_PATTERN = r'''
+    (?P<preprocessor>^\s*\#\s*\w+)
+  | (?P<line_comment>//.*)
+  | (?P<block_comment>/\*.*?(?P<comment_end>\*/|$))
+  | (?P<string>"(?:[^"\\]|\\.)*(?P<string_end>"|\\$|$))
+  | (?P<char>'(?:[^'\\]|\\.)*')
+  | (?P<number>\b\d+\.?\d*[fFlL]?\b)
+'''
+TOKEN_TAGS = {
+    "preprocessor": "hl_preprocessor",
+    "line_comment": "hl_comment",
+    "block_comment": "hl_comment",
+    "string": "hl_string",
+    "char": "hl_char",
+    "number": "hl_number",
+}
 
+tokenizer_cache = {}  # theme_key -> {"pattern": ..., "word_tags": ...}
+theme_key = None
 
-code_editor.bind("<KeyRelease>", on_edit)
-code_editor.bind("<Button-1>", lambda e: code_editor.after(1, highlight_current_line))
-code_editor.bind("<ButtonRelease-1>", lambda e: highlight_current_line())
+HIGHLIGHT_CHUNK_LINES = 200  # lines read past the dirty range in one job
+HIGHLIGHT_BATCH_RANGES = 500  # ranges per tag_add call
+HIGHLIGHT_SLICE_MS = 8        # max Tk time spent applying tags per after() slice
 
+line_states = []  # end-of-line lexer state for every line of the editor
+hl_dirty = None   # [first_line, last_line] still waiting to be retokenized
+hl_job = None     # snapshot currently being tokenized or applied
+hl_pending = []   # [first_line, last_line] ranges of a huge file not highlighted yet
+hl_disabled = False   # buffer is above the "highlight_max_kb" limit
+hl_viewport_first = False  # buffer is above the "highlight_viewport_first_kb" limit
+edit_generation = 0   # bumped by every buffer edit
+highlight_epoch = 0   # bumped by every full rehighlight
+
+
+def get_tokenizer():
+    """Build (or reuse) the single-pass tokenizer for the loaded theme"""
+    tokenizer = tokenizer_cache.get(theme_key)
+    if tokenizer is not None:
+        return tokenizer
 
-def highlight_code():
-    """Enhanced syntax highlighting using theme from JSON"""
-    if not active_tab:
-        return
-    
-    # Remove all previous tags
-    for tag in code_editor.tag_names():
-        if tag.startswith("hl_"):
-            code_editor.tag_remove(tag, "1.0", "end")
-    
-    if not settings["syntax_highlighting"]:
-        return
-    
-    text = code_editor.get("1.0", "end-1c")
-    
-    # Get colors from theme (with fallbacks)
     t = theme or {}
-    kw_color = t.get("keywords", {}).get("fallback", "#ff79c6")  # fallback for keywords
-    str_color = t.get("string", "#f1fa8c")
-    char_color = t.get("char_literal", "#f1fa8c")
-    comment_color = t.get("comment", "#6272a4")
-    preprocessor_color = t.get("preprocessor", "#8be9fd")
-    number_color = t.get("number", "#bd93f9")
+    word_tags = {}
+    for word in t.get("keywords", {}):
+        if word != "fallback":
+            word_tags[word] = f"hl_keyword_{word}"
+    for word in ["cout", "cin"]:
+        word_tags.setdefault(word, f"hl_{word}")
+
+    pattern = TOKEN_PATTERN
+    if word_tags:
+        words = sorted(word_tags, key=len, reverse=True)
+        pattern += r"  | (?P<word>\b(?:" + "|".join(re.escape(w) for w in words) + r")\b)" + "\n"
+    tokenizer = {"pattern": re.compile(pattern, re.VERBOSE | re.MULTILINE), "word_tags": word_tags}
+    tokenizer_cache[theme_key] = tokenizer
+    return tokenizer
+
+
+def tokenize_line(text, start, end, state, tokenizer):
+    """Tokenize text[start:end] (one line) starting in lexer `state`, return (spans, end_state)"""
+    spans = []
+    pos = start
+
+    if state == STATE_BLOCK_COMMENT:
+        close = text.find("*/", start, end)
+        if close == -1:
+            if end > start:
+                spans.append(("hl_comment", start, end))
+            return spans, STATE_BLOCK_COMMENT
+        pos = close + 2
+        spans.append(("hl_comment", start, pos))
+    elif state == STATE_STRING:
+        match = STRING_TAIL_RE.match(text, start, end)
+        pos = match.end()
+        if pos > start:
+            spans.append(("hl_string", start, pos))
+        if match.group("string_end") == "\\":
+            return spans, STATE_STRING
+
+    state = STATE_NORMAL
+    word_tags = tokenizer["word_tags"]
+    for match in tokenizer["pattern"].finditer(text, pos, end):
+        kind = match.lastgroup
+        if kind == "word":
+            spans.append((word_tags[match.group()], match.start(), match.end()))
+            continue
+        spans.append((TOKEN_TAGS[kind], match.start(), match.end()))
+        if kind == "block_comment" and not match.group("comment_end"):
+            state = STATE_BLOCK_COMMENT
+        elif kind == "string" and match.group("string_end") == "\\":
+            state = STATE_STRING
+    return spans, state
+
+
+def configure_highlight_tags(editor=None):
+    """Configure hl_* tag colors from the theme"""
+    editor = editor or code_editor
+    t = theme or {}
     cout_cin_color = t.get("cout_cin", "#50fa7b")
 
-    # First pass: Mark strings and comments (highest priority)
-    for match in re.finditer(r'"(?:[^"\\]|\\.)*"', text):
-        start = f"1.0 + {match.start()} chars"
-        end = f"1.0 + {match.end()} chars"
-        code_editor.tag_add("hl_string", start, end)
-    
-    for match in re.finditer(r"'(?:[^'\\]|\\.)*'", text):
-        start = f"1.0 + {match.start()} chars"
-        end = f"1.0 + {match.end()} chars"
-        code_editor.tag_add("hl_char", start, end)
-    
-    # Single-line comments
-    for match in re.finditer(r'//.*?$', text, re.MULTILINE):
-        start = f"1.0 + {match.start()} chars"
-        end = f"1.0 + {match.end()} chars"
-        code_editor.tag_add("hl_comment", start, end)
-    
-    # Multi-line comments
-    for match in re.finditer(r'/\*.*?\*/', text, re.DOTALL):
-        start = f"1.0 + {match.start()} chars"
-        end = f"1.0 + {match.end()} chars"
-        code_editor.tag_add("hl_comment", start, end)
-    
-    # Preprocessor directives
-    for match in re.finditer(r'^\s*#\s*\w+', text, re.MULTILINE):
-        start = f"1.0 + {match.start()} chars"
-        end = f"1.0 + {match.end()} chars"
-        code_editor.tag_add("hl_preprocessor", start, end)
-    
-    # Numbers
-    for match in re.finditer(r'\b\d+\.?\d*[fFlL]?\b', text):
-        start_idx = match.start()
-        end_idx = match.end()
-        start = f"1.0 + {start_idx} chars"
-        end = f"1.0 + {end_idx} chars"
-        if not any(code_editor.tag_names(start)):  # not in string/comment
-            code_editor.tag_add("hl_number", start, end)
-    
-    # Second pass: Keywords (respect existing tags)
-    if "keywords" in t:
-        for word, color in t["keywords"].items():
-            if word == "fallback":
-                continue
-            pattern = rf'\b{re.escape(word)}\b'
-            for match in re.finditer(pattern, text):
-                start_idx = match.start()
-                end_idx = match.end()
-                start = f"1.0 + {start_idx} chars"
-                end = f"1.0 + {end_idx} chars"
-                if not any(code_editor.tag_names(start)):
-                    tag_name = f"hl_keyword_{word}"
-                    code_editor.tag_add(tag_name, start, end)
-                    code_editor.tag_configure(tag_name, foreground=color)
-    
-    # Special: cout and cin
+    for word, color in t.get("keywords", {}).items():
+        if word != "fallback":
+            editor.tag_configure(f"hl_keyword_{word}", foreground=color)
     for word in ["cout", "cin"]:
-        pattern = rf'\b{word}\b'
-        for match in re.finditer(pattern, text):
-            start_idx = match.start()
-            end_idx = match.end()
-            start = f"1.0 + {start_idx} chars"
-            end = f"1.0 + {end_idx} chars"
-            if not any(code_editor.tag_names(start)):
-                code_editor.tag_add(f"hl_{word}", start, end)
-                code_editor.tag_configure(f"hl_{word}", foreground=cout_cin_color)
-    
-    # Configure global tags
-    code_editor.tag_configure("hl_string", foreground=str_color)
-    code_editor.tag_configure("hl_char", foreground=char_color)
-    code_editor.tag_configure("hl_comment", foreground=comment_color)
-    code_editor.tag_configure("hl_preprocessor", foreground=preprocessor_color)
-    code_editor.tag_configure("hl_number", foreground=number_color)
-    
+        editor.tag_configure(f"hl_{word}", foreground=cout_cin_color)
+
+    editor.tag_configure("hl_string", foreground=t.get("string", "#f1fa8c"))
+    editor.tag_configure("hl_char", foreground=t.get("char_literal", "#f1fa8c"))
+    editor.tag_configure("hl_comment", foreground=t.get("comment", "#6272a4"))
+    editor.tag_configure("hl_preprocessor", foreground=t.get("preprocessor", "#8be9fd"))
+    editor.tag_configure("hl_number", foreground=t.get("number", "#bd93f9"))
+
     # Raise priority
-    code_editor.tag_raise("hl_string")
-    code_editor.tag_raise("hl_char")
-    code_editor.tag_raise("hl_comment")
+    editor.tag_raise("hl_string")
+    editor.tag_raise("hl_char")
+    editor.tag_raise("hl_comment")
+
+
+def editor_line_count():
+    return int(code_editor.index("end-1c").split('.')[0])
+
+
+def mark_lines_dirty(first, last):
+    global hl_dirty
+    if hl_dirty is None:
+        hl_dirty = [first, last]
+    else:
+        hl_dirty = [min(hl_dirty[0], first), max(hl_dirty[1], last)]
+
+
+def shift_line_range(line_range, line, delta):
+    """Shift a [first, last] line range for an edit at `line` that added `delta` lines"""
+    first, last = line_range
+    if last > line:
+        last = max(line, last + delta)
+    if first > line:
+        first = max(line, first + delta)
+    return [first, last]
+
+
+def note_edit(line, delta):
+    """Shift line states and the dirty range after an edit at `line` that added `delta` lines"""
+    global hl_dirty, hl_pending
+    if delta > 0:
+        line_states[line:line] = [STATE_NORMAL] * delta
+    elif delta < 0:
+        del line_states[line:line - delta]
+    if delta:
+        if hl_dirty is not None:
+            hl_dirty = shift_line_range(hl_dirty, line, delta)
+        hl_pending = [shift_line_range(r, line, delta) for r in hl_pending]
+    mark_lines_dirty(line, line + max(delta, 0))
+
+
+def remove_pending_lines(first, last):
+    """Drop [first, last] from the not-yet-highlighted ranges"""
+    global hl_pending
+    remaining = []
+    for start, stop in hl_pending:
+        if stop < first or start > last:
+            remaining.append([start, stop])
+            continue
+        if start < first:
+            remaining.append([start, first - 1])
+        if stop > last:
+            remaining.append([last + 1, stop])
+    hl_pending = remaining
+
+
+def line_is_pending(line):
+    return any(start <= line <= stop for start, stop in hl_pending)
+
+
+def visible_line_range():
+    first = int(code_editor.index("@0,0").split('.')[0])
+    last = int(code_editor.index(f"@0,{code_editor.winfo_height()}").split('.')[0])
+    return first, max(first, last)
+
+
+def next_pending_range():
+    """Pick the next chunk to fill in: visible lines first, then the closest ones"""
+    view_first, view_last = visible_line_range()
+    best = None
+    for first, last in hl_pending:
+        if last >= view_first and first <= view_last:
+            start = max(first, view_first)
+            return start, min(last, start + HIGHLIGHT_CHUNK_LINES - 1)
+        distance = view_first - last if last < view_first else first - view_last
+        if best is None or distance < best[0]:
+            best = (distance, first, last)
+    _, first, last = best
+    if last < view_first:
+        return max(first, last - HIGHLIGHT_CHUNK_LINES + 1), last
+    return first, min(last, first + HIGHLIGHT_CHUNK_LINES - 1)
+
+
+def editor_char_count():
+    count = code_editor.count("1.0", "end-1c", "chars")
+    if isinstance(count, tuple):
+        count = count[0]
+    return count or 0
+
+
+def highlight_code():
+    """Enhanced syntax highlighting using theme from JSON (full document)"""
+    global line_states, hl_dirty, hl_pending, hl_disabled, hl_viewport_first, highlight_epoch
+    if not active_tab:
+        return
+
+    # Any job still tokenizing or applying belongs to the previous pass
+    highlight_epoch += 1
+    hl_pending = []
+
+    size_kb = editor_char_count() / 1024
+    hl_disabled = size_kb > settings.get("highlight_max_kb", 8192)
+    if not settings["syntax_highlighting"] or hl_disabled:
+        # Remove all previous tags
+        for tag in code_editor.tag_names():
+            if tag.startswith("hl_"):
+                code_editor.tag_remove(tag, "1.0", "end")
+        hl_dirty = None
+        return
+
+    total = editor_line_count()
+    line_states = [STATE_NORMAL] * total
+    hl_viewport_first = size_kb > settings.get("highlight_viewport_first_kb", 512)
+    if hl_viewport_first:
+        # Huge file: visible lines first, the rest fills in around them
+        hl_dirty = None
+        hl_pending = [[1, total]]
+    else:
+        hl_dirty = [1, total]
+    highlight_dirty_lines()
+
+
+def schedule_highlight(delay=120):
+    global highlight_after_id
+    if highlight_after_id:
+        app.after_cancel(highlight_after_id)
+    highlight_after_id = app.after(delay, highlight_dirty_lines)
+
+
+def highlight_all_tabs():
+    """Re-highlight the active tab now and the others when they are next shown"""
+    for tab in tabs.values():
+        tab["rehighlight"] = tab["id"] != active_tab
+    highlight_code()
+
+
+def highlight_version():
+    return (edit_generation, highlight_epoch)
+
+
+def highlight_dirty_lines():
+    """Snapshot the next dirty (or pending) lines and tokenize them on a worker thread"""
+    global line_states, hl_dirty, hl_job, highlight_after_id
+    highlight_after_id = None
+    if not active_tab or hl_job is not None:
+        return
+    if not settings["syntax_highlighting"] or hl_disabled:
+        hl_dirty = None
+        return
+
+    total = editor_line_count()
+    if len(line_states) != total:
+        line_states = [STATE_NORMAL] * total
+        hl_dirty = [1, total]
+
+    if hl_dirty is not None and hl_viewport_first and hl_dirty[1] - hl_dirty[0] >= HIGHLIGHT_CHUNK_LINES:
+        # Large dirty range in a huge file: let the viewport-first fill handle it
+        hl_pending.append(hl_dirty)
+        hl_dirty = None
+
+    if hl_dirty is not None:
+        kind = "dirty"
+        first = max(1, min(hl_dirty[0], total))
+        last = max(first, min(hl_dirty[1], total))
+        stop = min(total, last + HIGHLIGHT_CHUNK_LINES)
+    elif hl_pending:
+        kind = "fill"
+        first, last = next_pending_range()
+        first = max(1, min(first, total))
+        last = max(first, min(last, total))
+        stop = last
+    else:
+        return
+
+    configure_highlight_tags()
+    hl_job = {
+        "kind": kind,
+        "version": highlight_version(),
+        "text": code_editor.get(f"{first}.0", f"{stop}.end"),
+        "first": first,
+        "last": last,
+        "total": total,
+        "state": line_states[first - 2] if first > 1 else STATE_NORMAL,
+        "old_states": line_states[first - 1:stop],
+        "tokenizer": get_tokenizer(),
+    }
+    threading.Thread(target=tokenize_snapshot, args=(hl_job,), daemon=True).start()
+
+
+def tokenize_snapshot(job):
+    """Worker thread: tokenize a text snapshot until the lexer state converges, never touches Tk"""
+    text = job["text"]
+    first = job["first"]
+    last = job["last"]
+    old_states = job["old_states"]
+    tokenizer = job["tokenizer"]
+    state = job["state"]
+
+    line_starts = build_line_table(text)
+    ranges = {}  # tag -> [start, end, start, end, ...] for batched tag_add
+    new_states = []
+    converged = False
+    for offset, line_start in enumerate(line_starts):
+        line_no = first + offset
+        if offset + 1 < len(line_starts):
+            line_end = line_starts[offset + 1] - 1
+        else:
+            line_end = len(text)
+        spans, state = tokenize_line(text, line_start, line_end, state, tokenizer)
+        for tag_name, span_start, span_end in spans:
+            ranges.setdefault(tag_name, []).extend((
+                offset_to_index(line_starts, span_start, first),
+                offset_to_index(line_starts, span_end, first)
+            ))
+        new_states.append(state)
+        if line_no >= last and old_states[offset] == state:
+            converged = True
+            break
+
+    batches = []
+    for tag_name, indices in ranges.items():
+        for i in range(0, len(indices), HIGHLIGHT_BATCH_RANGES * 2):
+            batches.append((tag_name, indices[i:i + HIGHLIGHT_BATCH_RANGES * 2]))
+
+    job["done"] = first + len(new_states) - 1
+    job["converged"] = converged or job["done"] >= job["total"]
+    job["new_states"] = new_states
+    job["batches"] = batches
+    job["next_batch"] = 0
+    job["cleared"] = False
+    app.after(0, lambda: apply_highlight_job(job))
+
+
+def apply_highlight_job(job):
+    """Apply a finished job's tags in time slices, dropping it if the buffer moved on"""
+    global hl_job, hl_dirty
+    if job is not hl_job:
+        return
+    if job["version"] != highlight_version():
+        hl_job = None
+        schedule_highlight()
+        return
+
+    first = job["first"]
+    done = job["done"]
+    if not job["cleared"]:
+        # Re-tag only the retokenized range
+        for tag in code_editor.tag_names():
+            if tag.startswith("hl_"):
+                code_editor.tag_remove(tag, f"{first}.0", f"{done}.end")
+        job["cleared"] = True
+
+    deadline = time.perf_counter() + HIGHLIGHT_SLICE_MS / 1000
+    batches = job["batches"]
+    while job["next_batch"] < len(batches):
+        tag_name, indices = batches[job["next_batch"]]
+        job["next_batch"] += 1
+        code_editor.tag_add(tag_name, *indices)
+        if time.perf_counter() >= deadline:
+            app.after(1, lambda: apply_highlight_job(job))
+            return
+
+    line_states[first - 1:done] = job["new_states"]
+    remove_pending_lines(first, done)
+    hl_job = None
+    if job["kind"] == "dirty":
+        hl_dirty = None
+    if not job["converged"] and not line_is_pending(done + 1):
+        mark_lines_dirty(done + 1, max(job["last"], done + 1))
+    if hl_dirty is not None or hl_pending:
+        app.after(1, highlight_dirty_lines)
+
+
+def install_editor_proxy(editor):
+    """Route every insert/delete through a proxy so edits can mark their lines dirty.
+
+    The widget command becomes a Tcl proc around the Python proxy, so errors
+    from the original widget reach the caller as Tcl errors: Tk's bindings
+    rely on them (tk_textCopy catches `get sel.first sel.last` to detect
+    "no selection").
+    """
+    orig = editor._w + "_orig"
+    dispatch = editor._w + "_proxy"
+
+    def editor_proxy(command, *args):
+        global line_states, edit_generation
+        try:
+            if editor is not code_editor:
+                # Only the visible tab's editor owns the highlighter/minimap state
+                return ("ok", app.tk.call((orig, command) + args))
+            if command in ("insert", "delete", "replace") and args:
+                edit_generation += 1
+                before = int(str(app.tk.call(orig, "index", "end-1c")).split('.')[0])
+                line = int(str(app.tk.call(orig, "index", args[0])).split('.')[0])
+                result = app.tk.call((orig, command) + args)
+                after = int(str(app.tk.call(orig, "index", "end-1c")).split('.')[0])
+                note_edit(min(line, before), after - before)
+                note_minimap_edit(min(line, before), after - before)
+                return ("ok", result)
+            if command == "edit" and args and args[0] in ("undo", "redo"):
+                edit_generation += 1
+                result = app.tk.call((orig, command) + args)
+                total = int(str(app.tk.call(orig, "index", "end-1c")).split('.')[0])
+                line_states = [STATE_NORMAL] * total
+                mark_lines_dirty(1, total)
+                minimap_lines.clear()
+                return ("ok", result)
+            return ("ok", app.tk.call((orig, command) + args))
+        except tk.TclError as e:
+            # Raising here would abort mainloop; the proc re-raises it in Tcl
+            return ("error", str(e))
+
+    app.tk.call("rename", editor._w, orig)
+    app.tk.createcommand(dispatch, editor_proxy)
+    app.tk.call("proc", editor._w, "args", f"lassign [{dispatch} {{*}}$args] code result\nreturn -code $code $result")
+
 
 def load_syntax(file_path, silent=False):
-    global theme
+    global theme, theme_key
     try:
         with open(file_path, "r", encoding="utf-8") as f:
             loaded = json.load(f)
             theme = loaded
+        theme_key = (os.path.abspath(file_path), os.path.getmtime(file_path))
         
         if not silent:
             messagebox.showinfo("Syntax Loaded", f"Loaded: {os.path.basename(file_path)}")
-        highlight_code()
     except Exception as e:
         if not silent:
             messagebox.showerror("Error", f"Failed to load syntax file:\n{e}")
         theme = {}
-        highlight_code()
+        theme_key = None
+    for tab in tabs.values():
+        if tab["editor"] is not None:
+            configure_highlight_tags(tab["editor"])
+    highlight_all_tabs()
 
 
 load_syntax(SYNTAX_FILE, silent=True)
 
 # File operations
-def save_current_tab():
+def save_current_tab(speculate=True):
+    """Save the active tab; speculate starts a background build of the saved file"""
     if active_tab is None:
         return False
     tab = tabs[active_tab]
     if tab["path"] is None:
-        return save_as_current_tab()
+        return save_as_current_tab(speculate)
     try:
+        # A background auto-save still writing must not replace this afterwards
+        wait_for_auto_save(tab)
         # Clean the content before saving
-        cleaned_content = clean_code_text(tab["content"])
-        
-        with open(tab["path"], "w", encoding="utf-8") as f:
-            f.write(cleaned_content)
+        content = get_tab_content(tab)
+        cleaned_content, changes = clean_code_text(content)
         
-        # Update the tab content to the cleaned version
-        tab["content"] = cleaned_content
-        tab["saved_content"] = cleaned_content
+        with tab["auto_save_lock"]:
+            write_file_atomic(tab["path"], cleaned_content)
+        tab["disk_hash"] = hash(cleaned_content)
         
-        # Update the editor display if content changed
-        if cleaned_content != code_editor.get("1.0", "end-1c"):
-            code_editor.delete("1.0", "end")
-            code_editor.insert("1.0", cleaned_content)
-            highlight_code()
+        # Patch only the cleaned characters in the editor
+        if changes:
+            patch_editor_text(content, changes)
         
-        if tab["button"].cget("text").endswith("*"):
-            tab["button"].configure(text=tab["display"])
+        mark_tab_saved(tab, cleaned_content)
+        if speculate:
+            start_speculative_build(tab)
+        else:
+            # A build of the previous save would only compete with the caller's
+            cancel_speculative_build(tab["id"])
         return True
     except Exception as e:
         messagebox.showerror("Save Failed", f"Could not save:\n{e}")
         return False
 
 
-def save_as_current_tab():
+def save_as_current_tab(speculate=True):
     if active_tab is None:
         return False
     tab = tabs[active_tab]
@@ -777,25 +1635,28 @@ def save_as_current_tab():
     if not path:
         return False
     try:
+        wait_for_auto_save(tab)
         # Clean the content before saving
-        cleaned_content = clean_code_text(tab["content"])
+        content = get_tab_content(tab)
+        cleaned_content, changes = clean_code_text(content)
         
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(cleaned_content)
+        with tab["auto_save_lock"]:
+            write_file_atomic(path, cleaned_content)
         
         tab["path"] = path
-        tab["content"] = cleaned_content
-        tab["saved_content"] = cleaned_content
+        tab["disk_hash"] = hash(cleaned_content)
         
-        # Update the editor display if content changed
-        if cleaned_content != code_editor.get("1.0", "end-1c"):
-            code_editor.delete("1.0", "end")
-            code_editor.insert("1.0", cleaned_content)
-            highlight_code()
+        # Patch only the cleaned characters in the editor
+        if changes:
+            patch_editor_text(content, changes)
         
         filename = os.path.basename(path)
         tab["display"] = filename
-        tab["button"].configure(text=filename)
+        mark_tab_saved(tab, cleaned_content)
+        if speculate:
+            start_speculative_build(tab)
+        else:
+            cancel_speculative_build(tab["id"])
         return True
     except Exception as e:
         messagebox.showerror("Save Failed", f"Could not save:\n{e}")
@@ -814,30 +1675,147 @@ def open_file():
     new_tab(path=path)
 
 
-# Font & UI helpers
-def update_font_size(size):
-    global code_editor_font
-    size = int(size)
-    settings["font_size"] = size
-    code_editor_font = (settings["font_family"], size)
-    code_editor.configure(font=code_editor_font)
-    update_line_numbers()
-    update_minimap()
+# Auto-save: coalesce edits over an idle window, write on a background thread.
+# Each tab has its own timer, flushed when the tab is left or closed. Writers
+# never call into Tk (a threaded Tcl blocks a worker's after() until the main
+# loop serves it); the main thread polls for their results instead.
+AUTO_SAVE_POLL_MS = 50
 
 
-def update_tab_width(width):
-    width = int(width)
-    settings["tab_width"] = width
-    code_editor.configure(tabs=width * 8)
+def schedule_auto_save(tab):
+    if tab["auto_save_after"]:
+        app.after_cancel(tab["auto_save_after"])
+    tab["auto_save_after"] = app.after(int(settings.get("auto_save_delay_ms", 1000)), lambda: run_auto_save(tab))
 
 
-def update_font_lists():
-    global available_fonts
-    available_fonts = get_available_fonts()
-    if 'font_family_combo' in globals():
-        current = font_family_combo.get()
-        font_family_combo.configure(values=available_fonts)
-        if current not in available_fonts and available_fonts:
+def wait_for_auto_save(tab):
+    """Block until tab's in-flight background write is on disk and handled"""
+    job = tab["auto_save_job"]
+    if job is not None:
+        job["done"].wait()
+        collect_auto_save(tab, job)
+
+
+def flush_auto_save(tab, wait=False):
+    """Run tab's pending auto-save now; with wait, return only once it is on disk"""
+    if wait:
+        # A write that already started must reach os.replace before the tab or app goes
+        wait_for_auto_save(tab)
+    if tab["auto_save_after"]:
+        app.after_cancel(tab["auto_save_after"])
+        run_auto_save(tab, wait)
+
+
+def run_auto_save(tab, wait=False):
+    tab["auto_save_after"] = None
+    if tabs.get(tab["id"]) is not tab or not settings.get("auto_save"):
+        return
+    if tab["path"] is None or not is_tab_modified(tab):
+        return
+    if tab["auto_save_job"] is not None:
+        # Previous write still running, try again after another idle window
+        schedule_auto_save(tab)
+        return
+
+    content = get_tab_content(tab)
+    # Only the active editor's edits count towards edit_generation
+    generation = edit_generation if tab["id"] == active_tab else None
+    path = tab["path"]
+    disk_hash = tab.get("disk_hash")
+    lock = tab["auto_save_lock"]
+
+    def write():
+        result = {"content": content, "generation": generation, "elapsed": None, "error": None}
+        try:
+            cleaned_content, result["changes"] = clean_code_text(content)
+            result["cleaned"] = cleaned_content
+            if hash(cleaned_content) != disk_hash:
+                start = time.perf_counter()
+                with lock:
+                    write_file_atomic(path, cleaned_content)
+                result["elapsed"] = time.perf_counter() - start
+        except Exception as e:
+            result["error"] = e
+        return result
+
+    if wait:
+        finish_auto_save(tab, write())
+        return
+
+    job = {"done": threading.Event(), "result": None}
+
+    def write_in_background():
+        job["result"] = write()
+        job["done"].set()
+
+    tab["auto_save_job"] = job
+    threading.Thread(target=write_in_background, daemon=True).start()
+    app.after(AUTO_SAVE_POLL_MS, lambda: collect_auto_save(tab, job))
+
+
+def collect_auto_save(tab, job):
+    """Hand job's result to finish_auto_save once its writer is done"""
+    if tab["auto_save_job"] is not job:
+        return   # already collected by wait_for_auto_save
+    if not job["done"].is_set():
+        app.after(AUTO_SAVE_POLL_MS, lambda: collect_auto_save(tab, job))
+        return
+    tab["auto_save_job"] = None
+    finish_auto_save(tab, job["result"])
+
+
+def finish_auto_save(tab, result):
+    if result["error"] is not None:
+        set_editor_status(f"Auto-save failed: {result['error']}")
+        return
+    if tabs.get(tab["id"]) is not tab:
+        return
+    content = result["content"]
+    tab["disk_hash"] = hash(result["cleaned"])
+    if tab["id"] == active_tab and result["generation"] == edit_generation:
+        # Buffer untouched since the snapshot, so the change offsets still apply
+        if result["changes"]:
+            patch_editor_text(content, result["changes"])
+        mark_tab_saved(tab, result["cleaned"])
+    else:
+        # Edited (or switched away) while writing: the flag is recomputed on the next check
+        tab["saved_len"] = len(content)
+        tab["saved_hash"] = hash(content)
+    elapsed = result["elapsed"]
+    if elapsed is None:
+        set_editor_status(f"{tab['display']} unchanged on disk, write skipped")
+    else:
+        start_speculative_build(tab)
+        set_editor_status(f"Auto-saved {tab['display']} in {elapsed * 1000:.1f} ms")
+
+
+# Font & UI helpers
+def update_font_size(size):
+    global code_editor_font
+    size = int(size)
+    settings["font_size"] = size
+    code_editor_font = (settings["font_family"], size)
+    for tab in tabs.values():
+        if tab["editor"] is not None:
+            tab["editor"].configure(font=code_editor_font)
+    schedule_view_update()
+
+
+def update_tab_width(width):
+    width = int(width)
+    settings["tab_width"] = width
+    for tab in tabs.values():
+        if tab["editor"] is not None:
+            tab["editor"].configure(tabs=width * 8)
+
+
+def update_font_lists():
+    global available_fonts
+    available_fonts = get_available_fonts()
+    if 'font_family_combo' in globals():
+        current = font_family_combo.get()
+        font_family_combo.configure(values=available_fonts)
+        if current not in available_fonts and available_fonts:
             new_font = "Consolas"
             font_family_combo.set(new_font)
             settings["font_family"] = new_font
@@ -858,18 +1836,19 @@ def apply_settings_to_ui(settings_dict):
         minimap.grid_forget()
     
     try:
-        output_box.configure(
-            font=(settings["output_font_family"], settings["output_font_size"]),
-            fg=settings["output_text_color"],
-            bg=settings["output_bg_color"]
-        )
+        for widget in (output_box, log_text):
+            widget.configure(
+                font=(settings["output_font_family"], settings["output_font_size"]),
+                fg=settings["output_text_color"],
+                bg=settings["output_bg_color"]
+            )
+        monitor_canvas.configure(bg=settings["output_bg_color"])
     except tk.TclError:
         pass
     
-    highlight_code()
+    highlight_all_tabs()
     highlight_current_line()
-    update_line_numbers()
-    update_minimap()
+    schedule_view_update()
 
 
 # Settings window
@@ -892,7 +1871,7 @@ def open_settings():
     content_frame.pack(fill="both", expand=True, padx=20, pady=10)
 
     general_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
-    compiler_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
+    compiler_frame = ctk.CTkScrollableFrame(content_frame, fg_color="transparent")
     editor_settings_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
     syntax_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
     output_frame = ctk.CTkFrame(content_frame, fg_color="transparent")
@@ -993,6 +1972,15 @@ def open_settings():
     auto_save_switch.pack(anchor="w", padx=10, pady=5)
     auto_save_switch.select() if settings["auto_save"] else auto_save_switch.deselect()
 
+    ctk.CTkLabel(general_frame, text="Auto-save Delay (ms after last edit)", font=("Arial", 14)).pack(anchor="w", pady=(20, 5))
+    auto_save_delay_slider = ctk.CTkSlider(
+        general_frame,
+        from_=250, to=5000, number_of_steps=19,
+        command=lambda v: settings.update({"auto_save_delay_ms": int(v)})
+    )
+    auto_save_delay_slider.set(settings["auto_save_delay_ms"])
+    auto_save_delay_slider.pack(fill="x", padx=10, pady=5)
+
     ctk.CTkLabel(general_frame, text="Editor Font Family", font=("Arial", 14)).pack(anchor="w", pady=(20, 5))
     global font_family_combo
     font_family_combo = ctk.CTkComboBox(
@@ -1044,6 +2032,128 @@ def open_settings():
     show_cmd_switch.pack(anchor="w", padx=10, pady=5)
     show_cmd_switch.select() if settings["show_compiler_cmd"] else show_cmd_switch.deselect()
 
+    ctk.CTkLabel(compiler_frame, text="Build Cache (skip recompiling unchanged code)", font=("Arial", 14)).pack(anchor="w", pady=(20, 5))
+    build_cache_switch = ctk.CTkSwitch(
+        compiler_frame, text="Enable",
+        command=lambda: settings.update({"build_cache": build_cache_switch.get()})
+    )
+    build_cache_switch.pack(anchor="w", padx=10, pady=5)
+    build_cache_switch.select() if settings["build_cache"] else build_cache_switch.deselect()
+
+    ctk.CTkLabel(compiler_frame, text="Precompiled Headers (leading #include <...> block)", font=("Arial", 14)).pack(anchor="w", pady=(20, 5))
+    pch_switch = ctk.CTkSwitch(
+        compiler_frame, text="Enable",
+        command=lambda: settings.update({"precompiled_headers": pch_switch.get()})
+    )
+    pch_switch.pack(anchor="w", padx=10, pady=5)
+    pch_switch.select() if settings["precompiled_headers"] else pch_switch.deselect()
+
+    ctk.CTkLabel(compiler_frame, text="Compile in Background on Save", font=("Arial", 14)).pack(anchor="w", pady=(20, 5))
+    speculative_switch = ctk.CTkSwitch(
+        compiler_frame, text="Enable (needs the build cache)",
+        command=lambda: settings.update({"speculative_compile": speculative_switch.get()})
+    )
+    speculative_switch.pack(anchor="w", padx=10, pady=5)
+    speculative_switch.select() if settings["speculative_compile"] else speculative_switch.deselect()
+
+    ctk.CTkLabel(compiler_frame, text="Project Mode (build every .cpp in the file's folder)", font=("Arial", 14)).pack(anchor="w", pady=(20, 5))
+    project_mode_switch = ctk.CTkSwitch(
+        compiler_frame, text="Enable",
+        command=lambda: settings.update({"project_mode": project_mode_switch.get()})
+    )
+    project_mode_switch.pack(anchor="w", padx=10, pady=5)
+    project_mode_switch.select() if settings["project_mode"] else project_mode_switch.deselect()
+
+    ctk.CTkLabel(compiler_frame, text="Check Syntax While Typing", font=("Arial", 14)).pack(anchor="w", pady=(20, 5))
+    syntax_check_switch = ctk.CTkSwitch(
+        compiler_frame, text="Enable",
+        command=lambda: settings.update({"syntax_check": syntax_check_switch.get()})
+    )
+    syntax_check_switch.pack(anchor="w", padx=10, pady=5)
+    syntax_check_switch.select() if settings["syntax_check"] else syntax_check_switch.deselect()
+
+    ctk.CTkLabel(compiler_frame, text="Test Case Comparison", font=("Arial", 14)).pack(anchor="w", pady=(20, 5))
+    test_compare_combo = ctk.CTkComboBox(
+        compiler_frame,
+        values=list(TEST_COMPARE_MODES),
+        state="readonly",
+        command=lambda v: settings.update({"test_compare_mode": TEST_COMPARE_MODES[v]})
+    )
+    test_compare_combo.set(next(label for label, mode in TEST_COMPARE_MODES.items() if mode == settings["test_compare_mode"]))
+    test_compare_combo.pack(fill="x", padx=10, pady=5)
+
+    ctk.CTkLabel(compiler_frame, text="Test Case Time Limit (s)", font=("Arial", 14)).pack(anchor="w", pady=(20, 5))
+    test_time_limit_slider = ctk.CTkSlider(
+        compiler_frame,
+        from_=1, to=60, number_of_steps=59,
+        command=lambda v: settings.update({"test_time_limit_s": int(v)})
+    )
+    test_time_limit_slider.set(settings["test_time_limit_s"])
+    test_time_limit_slider.pack(fill="x", padx=10, pady=5)
+
+    ctk.CTkLabel(compiler_frame, text="Run Limits (0 = unlimited)", font=("Arial", 14)).pack(anchor="w", pady=(20, 5))
+    ctk.CTkLabel(compiler_frame, text="Wall time (s)").pack(anchor="w", padx=10)
+    run_wall_limit_slider = ctk.CTkSlider(
+        compiler_frame,
+        from_=0, to=300, number_of_steps=60,
+        command=lambda v: settings.update({"run_wall_limit_s": int(v)})
+    )
+    run_wall_limit_slider.set(settings["run_wall_limit_s"])
+    run_wall_limit_slider.pack(fill="x", padx=10, pady=5)
+
+    ctk.CTkLabel(compiler_frame, text="CPU time (s)").pack(anchor="w", padx=10)
+    run_cpu_limit_slider = ctk.CTkSlider(
+        compiler_frame,
+        from_=0, to=300, number_of_steps=60,
+        command=lambda v: settings.update({"run_cpu_limit_s": int(v)})
+    )
+    run_cpu_limit_slider.set(settings["run_cpu_limit_s"])
+    run_cpu_limit_slider.pack(fill="x", padx=10, pady=5)
+
+    ctk.CTkLabel(compiler_frame, text="Memory (MB)").pack(anchor="w", padx=10)
+    run_memory_limit_slider = ctk.CTkSlider(
+        compiler_frame,
+        from_=0, to=16384, number_of_steps=64,
+        command=lambda v: settings.update({"run_memory_limit_mb": int(v)})
+    )
+    run_memory_limit_slider.set(settings["run_memory_limit_mb"])
+    run_memory_limit_slider.pack(fill="x", padx=10, pady=5)
+
+    ctk.CTkLabel(compiler_frame, text="Resource Monitor Sample Interval (ms)", font=("Arial", 14)).pack(anchor="w", pady=(20, 5))
+    monitor_interval_slider = ctk.CTkSlider(
+        compiler_frame,
+        from_=50, to=1000, number_of_steps=19,
+        command=lambda v: settings.update({"monitor_interval_ms": int(v)})
+    )
+    monitor_interval_slider.set(settings["monitor_interval_ms"])
+    monitor_interval_slider.pack(fill="x", padx=10, pady=5)
+
+    ctk.CTkLabel(compiler_frame, text="Benchmark Runs", font=("Arial", 14)).pack(anchor="w", pady=(20, 5))
+    benchmark_runs_slider = ctk.CTkSlider(
+        compiler_frame,
+        from_=2, to=100, number_of_steps=98,
+        command=lambda v: settings.update({"benchmark_runs": int(v)})
+    )
+    benchmark_runs_slider.set(settings["benchmark_runs"])
+    benchmark_runs_slider.pack(fill="x", padx=10, pady=5)
+
+    ctk.CTkLabel(compiler_frame, text="Benchmark Warmup Runs", font=("Arial", 14)).pack(anchor="w", pady=(20, 5))
+    benchmark_warmup_slider = ctk.CTkSlider(
+        compiler_frame,
+        from_=0, to=10, number_of_steps=10,
+        command=lambda v: settings.update({"benchmark_warmup": int(v)})
+    )
+    benchmark_warmup_slider.set(settings["benchmark_warmup"])
+    benchmark_warmup_slider.pack(fill="x", padx=10, pady=5)
+
+    ctk.CTkLabel(compiler_frame, text="Pin Benchmark Runs to One CPU Core", font=("Arial", 14)).pack(anchor="w", pady=(20, 5))
+    benchmark_pin_switch = ctk.CTkSwitch(
+        compiler_frame, text="Enable",
+        command=lambda: settings.update({"benchmark_pin_cpu": benchmark_pin_switch.get()})
+    )
+    benchmark_pin_switch.pack(anchor="w", padx=10, pady=5)
+    benchmark_pin_switch.select() if settings["benchmark_pin_cpu"] else benchmark_pin_switch.deselect()
+
     # Editor Settings Tab
     ctk.CTkLabel(editor_settings_frame, text="Tab Width (spaces)", font=("Arial", 14)).pack(anchor="w", pady=5)
     tab_width_slider = ctk.CTkSlider(
@@ -1067,7 +2177,7 @@ def open_settings():
         editor_settings_frame, text="Enable",
         command=lambda: (
             settings.update({"syntax_highlighting": syntax_switch.get()}),
-            highlight_code()
+            highlight_all_tabs()
         )
     )
     syntax_switch.pack(anchor="w", padx=10, pady=5)
@@ -1158,7 +2268,22 @@ def open_settings():
             cpp_std_combo.set(DEFAULT_SETTINGS["cpp_standard"])
             tab_width_slider.set(DEFAULT_SETTINGS["tab_width"])
             auto_save_switch.select() if DEFAULT_SETTINGS["auto_save"] else auto_save_switch.deselect()
+            auto_save_delay_slider.set(DEFAULT_SETTINGS["auto_save_delay_ms"])
             show_cmd_switch.select() if DEFAULT_SETTINGS["show_compiler_cmd"] else show_cmd_switch.deselect()
+            build_cache_switch.select() if DEFAULT_SETTINGS["build_cache"] else build_cache_switch.deselect()
+            pch_switch.select() if DEFAULT_SETTINGS["precompiled_headers"] else pch_switch.deselect()
+            speculative_switch.select() if DEFAULT_SETTINGS["speculative_compile"] else speculative_switch.deselect()
+            project_mode_switch.select() if DEFAULT_SETTINGS["project_mode"] else project_mode_switch.deselect()
+            syntax_check_switch.select() if DEFAULT_SETTINGS["syntax_check"] else syntax_check_switch.deselect()
+            test_compare_combo.set(next(label for label, mode in TEST_COMPARE_MODES.items() if mode == DEFAULT_SETTINGS["test_compare_mode"]))
+            test_time_limit_slider.set(DEFAULT_SETTINGS["test_time_limit_s"])
+            run_wall_limit_slider.set(DEFAULT_SETTINGS["run_wall_limit_s"])
+            run_cpu_limit_slider.set(DEFAULT_SETTINGS["run_cpu_limit_s"])
+            run_memory_limit_slider.set(DEFAULT_SETTINGS["run_memory_limit_mb"])
+            monitor_interval_slider.set(DEFAULT_SETTINGS["monitor_interval_ms"])
+            benchmark_runs_slider.set(DEFAULT_SETTINGS["benchmark_runs"])
+            benchmark_warmup_slider.set(DEFAULT_SETTINGS["benchmark_warmup"])
+            benchmark_pin_switch.select() if DEFAULT_SETTINGS["benchmark_pin_cpu"] else benchmark_pin_switch.deselect()
             highlight_line_switch.select() if DEFAULT_SETTINGS["highlight_current_line"] else highlight_line_switch.deselect()
             syntax_switch.select() if DEFAULT_SETTINGS["syntax_highlighting"] else syntax_switch.deselect()
             show_system_fonts_switch.deselect()
@@ -1214,20 +2339,19 @@ bind_shortcut("<Control-r>", lambda: run_code())
 
 # Initial tab
 new_tab()
-tabs[active_tab]["content"] = """#include <iostream>
+code_editor.insert("1.0", """#include <iostream>
 using namespace std;
 
 int main() {
     cout << "Hello, Run++!" << endl;
     return 0;
 }
-"""
-tabs[active_tab]["saved_content"] = tabs[active_tab]["content"]
-code_editor.insert("1.0", tabs[active_tab]["content"])
+""")
+code_editor.edit_reset()
+mark_tab_saved(tabs[active_tab], code_editor.get("1.0", "end-1c"))
 highlight_code()
-switch_tab(active_tab)
 
-app.after(100, lambda: [update_line_numbers(), update_minimap()])
+app.after(100, schedule_view_update)
 
 # Right Panel
 right_frame = ctk.CTkFrame(paned, corner_radius=10)
@@ -1236,25 +2360,1260 @@ right_frame.grid_columnconfigure(0, weight=1)
 paned.add(right_frame, minsize=250)
 
 
-def run_code():
-    global process
+def user_cache_dir(name):
+    """Path of a per-user cache directory (not created)"""
+    if platform.system() == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "runpp", name)
+
+
+def ensure_private_dir(path):
+    """Create path accessible only to this user, refusing one owned by someone else.
+
+    What is kept there gets executed, force-included or shown later, so
+    nobody else may be able to swap files in it.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if hasattr(os, "getuid"):
+        info = os.lstat(path)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+            raise OSError(f"{path} is not a directory owned by this user")
+        if stat.S_IMODE(info.st_mode) & 0o077:
+            os.chmod(path, 0o700)
+    return path
+
+
+# Build cache: executables keyed on the source (plus its local includes),
+# the compiler identity and the flags, evicted least recently used first
+BUILD_CACHE_DIR = user_cache_dir("build_cache")
+LOCAL_INCLUDE_RE = re.compile(r'^\s*#\s*include\s*"([^"]+)"', re.MULTILINE)
+compiler_identities = {}
+
+
+def get_compiler_identity():
+    """First line of `<compiler> --version`, asked once per compiler"""
+    identity = compiler_identities.get(compiler_path)
+    if identity is None:
+        try:
+            result = subprocess.run(
+                [compiler_path, "--version"],
+                capture_output=True,
+                text=True,
+                timeout=5,
+                env=mingw_env,
+                creationflags=subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0
+            )
+            identity = result.stdout.splitlines()[0] if result.stdout else ""
+        except Exception:
+            identity = ""
+        compiler_identities[compiler_path] = identity
+    return identity
+
+
+def hash_source_tree(source_file, digest):
+    """Feed the source and every local "..." header it pulls in into digest"""
+    seen = set()
+    stack = [("", os.path.abspath(source_file))]
+    while stack:
+        name, path = stack.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            digest.update(b"missing\0" + name.encode("utf-8") + b"\0")
+            continue
+        digest.update(name.encode("utf-8") + b"\0" + str(len(data)).encode() + b"\0" + data)
+        directory = os.path.dirname(path)
+        for include in LOCAL_INCLUDE_RE.findall(data.decode("utf-8", "replace")):
+            candidate = os.path.normpath(os.path.join(directory, include))
+            if os.path.isfile(candidate):
+                stack.append((include, candidate))
+            else:
+                # Found on the system include path: covered by the compiler identity
+                digest.update(b"system\0" + include.encode("utf-8") + b"\0")
+
+
+def build_cache_key(source_file, flags):
+    digest = hashlib.sha256()
+    digest.update(f"{compiler_path}\0{get_compiler_identity()}\0".encode("utf-8"))
+    digest.update("\0".join(flags).encode("utf-8") + b"\0")
+    hash_source_tree(source_file, digest)
+    return digest.hexdigest()
+
+
+def build_cache_lookup(key):
+    """Return (cached exe, recorded compile time) or (None, None)"""
+    try:
+        exe = os.path.join(ensure_private_dir(BUILD_CACHE_DIR), key + ".exe")
+    except OSError:
+        return None, None
+    if not os.path.isfile(exe):
+        return None, None
+    try:
+        os.utime(exe)   # mtime doubles as the LRU clock
+    except OSError:
+        pass
+    try:
+        with open(os.path.join(BUILD_CACHE_DIR, key + ".json"), "r", encoding="utf-8") as f:
+            compile_time = json.load(f).get("compile_time")
+    except (OSError, ValueError):
+        compile_time = None
+    return exe, compile_time
+
+
+def build_cache_store(key, exe, compile_time):
+    ensure_private_dir(BUILD_CACHE_DIR)
+    fd, tmp_path = tempfile.mkstemp(dir=BUILD_CACHE_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copy2(exe, tmp_path)
+        os.replace(tmp_path, os.path.join(BUILD_CACHE_DIR, key + ".exe"))
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    with open(os.path.join(BUILD_CACHE_DIR, key + ".json"), "w", encoding="utf-8") as f:
+        json.dump({"compile_time": compile_time}, f)
+    trim_build_cache()
+
+
+def trim_build_cache():
+    """Drop least recently used executables until the cache fits build_cache_mb"""
+    limit = int(settings.get("build_cache_mb", 256)) * 1024 * 1024
+    entries = []
+    total = 0
+    for name in os.listdir(BUILD_CACHE_DIR):
+        if not name.endswith(".exe"):
+            continue
+        try:
+            st = os.stat(os.path.join(BUILD_CACHE_DIR, name))
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, name))
+        total += st.st_size
+    entries.sort()
+    for mtime, size, name in entries:
+        if total <= limit:
+            break
+        key = name[:-len(".exe")]
+        try:
+            os.remove(os.path.join(BUILD_CACHE_DIR, name))
+        except OSError:
+            # Still running, probably; try again next time
+            continue
+        total -= size
+        try:
+            os.remove(os.path.join(BUILD_CACHE_DIR, key + ".json"))
+        except OSError:
+            pass
+
+
+# Precompiled headers: the leading block of <system> includes is compiled
+# once per (compiler, flags, include block) and force-included afterwards
+PCH_CACHE_DIR = user_cache_dir("pch_cache")
+PCH_CACHE_LIMIT = 8
+SYSTEM_INCLUDE_RE = re.compile(r'#\s*include\s*<[^>]+>')
+pch_builds = set()   # pch dirs currently being built
+
+
+def leading_system_includes(text):
+    includes = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("//"):
+            continue
+        match = SYSTEM_INCLUDE_RE.fullmatch(stripped)
+        if not match:
+            break
+        includes.append(match.group(0))
+    return includes
+
+
+def prepare_pch(source_file, flags):
+    """Return the pch entry for the source's leading includes, or None"""
+    with open(source_file, "r", encoding="utf-8", errors="replace") as f:
+        includes = leading_system_includes(f.read())
+    if not includes:
+        return None
+    digest = hashlib.sha256()
+    digest.update(f"{compiler_path}\0{get_compiler_identity()}\0".encode("utf-8"))
+    digest.update("\0".join(flags).encode("utf-8") + b"\0")
+    digest.update("\n".join(includes).encode("utf-8"))
+    pch_dir = os.path.join(ensure_private_dir(PCH_CACHE_DIR), digest.hexdigest()[:32])
+    header = os.path.join(pch_dir, "runpp_pch.h")
+    os.makedirs(pch_dir, exist_ok=True)
+    if not os.path.isfile(header):
+        with open(header, "w", encoding="utf-8") as f:
+            f.write("\n".join(includes) + "\n")
+    os.utime(pch_dir)
+    return {
+        "dir": pch_dir,
+        "header": header,
+        "ready": os.path.isfile(header + ".gch"),
+        "baseline": os.path.join(pch_dir, "baseline.json")
+    }
+
+
+def read_pch_baseline(pch):
+    """Compile time recorded before the header was precompiled"""
+    try:
+        with open(pch["baseline"], "r", encoding="utf-8") as f:
+            return json.load(f).get("compile_time")
+    except (OSError, ValueError):
+        return None
+
+
+def build_pch_async(pch, flags, compile_time):
+    if pch["dir"] in pch_builds:
+        return
+    pch_builds.add(pch["dir"])
+
+    def build():
+        gch = pch["header"] + ".gch"
+        tmp_gch = gch + ".tmp"
+        try:
+            if read_pch_baseline(pch) is None:
+                with open(pch["baseline"], "w", encoding="utf-8") as f:
+                    json.dump({"compile_time": compile_time}, f)
+            proc = subprocess.Popen(
+                [compiler_path, "-x", "c++-header", pch["header"], "-o", tmp_gch] + flags,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                env=mingw_env,
+                **compiler_process_options(background=True)
+            )
+            lower_priority(proc)
+            if proc.wait() == 0:
+                os.replace(tmp_gch, gch)
+            trim_pch_cache()
+        except Exception:
+            pass
+        finally:
+            if os.path.exists(tmp_gch):
+                try:
+                    os.remove(tmp_gch)
+                except OSError:
+                    pass
+            pch_builds.discard(pch["dir"])
+
+    threading.Thread(target=build, daemon=True).start()
+
+
+def trim_pch_cache():
+    """Keep only the PCH_CACHE_LIMIT most recently used headers"""
+    entries = []
+    for name in os.listdir(PCH_CACHE_DIR):
+        path = os.path.join(PCH_CACHE_DIR, name)
+        try:
+            entries.append((os.path.getmtime(path), path))
+        except OSError:
+            pass
+    entries.sort(reverse=True)
+    for mtime, path in entries[PCH_CACHE_LIMIT:]:
+        if path not in pch_builds:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def current_compile_flags():
+    return [f"-std=c++{settings['cpp_standard']}"]
+
+
+# Compiler output is streamed line by line and parsed into diagnostics as it arrives
+DIAGNOSTIC_RE = re.compile(r'^(.*?):(\d+):(\d+): (fatal error|error|warning|note): (.*)$')
+COMPILE_FLUSH_SECONDS = 0.05
+COMPILE_OUTPUT_LIMIT = 256 * 1024   # chars of compiler output kept/shown per run
+MAX_DIAGNOSTICS = 200               # clickable entries materialised per run
+
+
+def parse_diagnostic(line, cwd):
+    """Turn a GCC 'file:line:col: severity: message' line into a dict, or None"""
+    match = DIAGNOSTIC_RE.match(line.rstrip("\r\n"))
+    if not match:
+        return None
+    path, row, column, severity, message = match.groups()
+    return {
+        "file": os.path.normpath(os.path.join(cwd, path)),
+        "line": int(row),
+        "column": int(column),
+        "severity": "error" if severity == "fatal error" else severity,
+        "message": message
+    }
+
+
+def compiler_process_options(background=False):
+    """Popen options hiding the console window; background jobs run at low priority.
+
+    Elsewhere background jobs are reniced with lower_priority() once started:
+    preexec_fn is not safe with the worker threads running.
+    """
+    if platform.system() == "Windows":
+        flags = subprocess.CREATE_NO_WINDOW
+        if background:
+            flags |= subprocess.BELOW_NORMAL_PRIORITY_CLASS
+        return {"creationflags": flags}
+    return {}
+
+
+def lower_priority(proc):
+    """Renice a just-started background job (Windows sets its priority class at spawn)"""
+    if platform.system() == "Windows":
+        return
+    try:
+        psutil.Process(proc.pid).nice(10)
+    except psutil.Error:
+        pass
+
+
+def run_compiler(command, cwd, on_output=None, build=None):
+    """Run a compiler command, streaming its output to on_output in batches.
+
+    on_output is called on the worker thread with a list of (line, diagnostic
+    or None). Returns a CompletedProcess whose stderr holds the first
+    COMPILE_OUTPUT_LIMIT chars, or None if `build` was cancelled meanwhile.
+    """
+    proc = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+        cwd=cwd,
+        env=mingw_env,
+        **compiler_process_options(background=build is not None)
+    )
+    if build is not None:
+        lower_priority(proc)
+        build["process"] = proc
+        if build["cancelled"]:
+            proc.kill()
+
+    kept = []
+    kept_size = 0
+    batch = []
+    last_flush = time.perf_counter()
+    for line in proc.stdout:
+        if kept_size < COMPILE_OUTPUT_LIMIT:
+            kept.append(line)
+            kept_size += len(line)
+        if on_output is not None:
+            batch.append((line, parse_diagnostic(line, cwd)))
+            if time.perf_counter() - last_flush >= COMPILE_FLUSH_SECONDS:
+                on_output(batch)
+                batch = []
+                last_flush = time.perf_counter()
+    proc.wait()
+    if batch:
+        on_output(batch)
+    if build is not None and build["cancelled"]:
+        return None
+    return subprocess.CompletedProcess(command, proc.returncode, "", "".join(kept))
+
+
+def compile_source(source_file, output_exe, flags, key=None, build=None, on_output=None):
+    """Compile with the PCH when ready and store the result in the build cache.
+
+    Returns (CompletedProcess, compile time, notes), or None if `build`
+    (a speculative build) was cancelled meanwhile.
+    """
+    notes = ["build cache miss"] if key else []
+    pch = None
+    command = [compiler_path, source_file, "-o", output_exe] + flags
+    if settings.get("precompiled_headers", True):
+        try:
+            pch = prepare_pch(source_file, flags)
+        except OSError:
+            pch = None
+        if pch and pch["ready"]:
+            command += ["-include", pch["header"]]
+
+    start = time.perf_counter()
+    result = run_compiler(command, os.path.dirname(source_file), on_output, build)
+    compile_time = time.perf_counter() - start
+    if result is None:
+        return None
+
+    if result.returncode == 0:
+        if key:
+            try:
+                build_cache_store(key, output_exe, compile_time)
+            except OSError:
+                pass
+        if pch and pch["ready"]:
+            baseline = read_pch_baseline(pch)
+            if baseline is not None:
+                notes.append(f"precompiled header, was {baseline:.2f} s without")
+            else:
+                notes.append("precompiled header")
+        elif pch:
+            build_pch_async(pch, flags, compile_time)
+            notes.append("precompiling headers for next run")
+    return result, compile_time, notes
+
+
+# Speculative builds: compile the saved file in the background so Run finds
+# the executable in the build cache (or waits on the build already running)
+speculative_builds = {}   # tab id -> build dict
+
+
+def cancel_speculative_build(tab_id):
+    build = speculative_builds.pop(tab_id, None)
+    if build is None:
+        return
+    build["cancelled"] = True
+    proc = build["process"]
+    if proc is not None and proc.poll() is None:
+        try:
+            proc.kill()
+        except OSError:
+            pass
+
+
+def start_speculative_build(tab):
+    if not settings.get("speculative_compile") or not settings.get("build_cache", True):
+        return
+    if settings.get("project_mode"):
+        return
+    if compiler_path is None or tab["path"] is None:
+        return
+    cancel_speculative_build(tab["id"])
+    source_file = os.path.abspath(tab["path"])
+    flags = current_compile_flags()
+    build = {"key": None, "process": None, "cancelled": False, "done": threading.Event()}
+    speculative_builds[tab["id"]] = build
+
+    def forget():
+        if speculative_builds.get(tab["id"]) is build:
+            del speculative_builds[tab["id"]]
+
+    def worker():
+        partial = None
+        try:
+            build["key"] = build_cache_key(source_file, flags)
+            if build["cancelled"] or build_cache_lookup(build["key"])[0]:
+                return
+            ensure_private_dir(BUILD_CACHE_DIR)
+            partial = os.path.join(BUILD_CACHE_DIR, f"{build['key']}.{threading.get_ident()}.part")
+            compile_source(source_file, partial, flags, key=build["key"], build=build)
+        except Exception:
+            pass
+        finally:
+            if partial and os.path.exists(partial):
+                try:
+                    os.remove(partial)
+                except OSError:
+                    pass
+            build["done"].set()
+            app.after(0, forget)
+
+    threading.Thread(target=worker, daemon=True).start()
+
+
+def wait_for_speculative_build(tab_id, key):
+    """Block until a background build of the same key finishes; True if there was one"""
+    build = speculative_builds.get(tab_id)
+    if build is None or build["done"].is_set() or build["key"] not in (None, key):
+        return False
+    build["done"].wait()
+    return build["key"] == key
+
+
+# Project builds: every translation unit next to the active file (or the
+# ones listed in runpp_project.json) is compiled in parallel into cached
+# objects, and -MMD depfiles decide which of them are stale
+PROJECT_MANIFEST = "runpp_project.json"
+PROJECT_BUILD_DIR = ".runpp_build"
+PROJECT_LINK_LIST = "linked.json"   # objects the executable was last linked from
+PROJECT_SOURCE_EXTENSIONS = (".cpp", ".cc", ".cxx")
+
+
+def load_project(source_file):
+    """Return (root, sources, extra flags, executable) for source_file's folder"""
+    root = os.path.dirname(os.path.abspath(source_file))
+    manifest = {}
+    manifest_path = os.path.join(root, PROJECT_MANIFEST)
+    if os.path.isfile(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    if "sources" in manifest:
+        sources = [os.path.normpath(os.path.join(root, s)) for s in manifest["sources"]]
+    else:
+        sources = sorted(
+            os.path.join(root, name) for name in os.listdir(root)
+            if name.lower().endswith(PROJECT_SOURCE_EXTENSIONS)
+        )
+    if not sources:
+        raise ValueError(f"No source files found in {root}")
+    name = manifest.get("output") or os.path.basename(root) or "main"
+    if not name.lower().endswith(".exe"):
+        name += ".exe"
+    return root, sources, list(manifest.get("flags", [])), os.path.join(root, name)
+
+
+def read_depfile(path, root):
+    """Dependencies listed in a make-style depfile written by -MMD"""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        text = f.read().replace("\\\r\n", " ").replace("\\\n", " ")
+    deps = text.partition(": ")[2]
+    return [
+        os.path.join(root, dep.replace("\\ ", " "))
+        for dep in re.split(r'(?<!\\)\s+', deps) if dep
+    ]
+
+
+def object_is_current(source, obj, depfile, root):
+    try:
+        obj_mtime = os.path.getmtime(obj)
+        deps = read_depfile(depfile, root)
+        return all(os.path.getmtime(path) <= obj_mtime for path in [source] + deps)
+    except OSError:
+        # No object/depfile yet, or a header it used has gone
+        return False
+
+
+def build_project(source_file, flags, on_output):
+    """Rebuild stale translation units in parallel and relink if needed.
+
+    Compiler output and progress lines go to on_output (see run_compiler),
+    from worker threads. Returns (executable, CompletedProcess of the failed
+    or final step).
+    """
+    root, sources, extra_flags, exe = load_project(source_file)
+    flags = flags + extra_flags
+    digest = hashlib.sha256(f"{compiler_path}\0{get_compiler_identity()}\0{chr(0).join(flags)}".encode("utf-8"))
+    build_dir = os.path.join(root, PROJECT_BUILD_DIR, digest.hexdigest()[:16])
+    os.makedirs(build_dir, exist_ok=True)
+
+    def report(text):
+        on_output([(text, None)])
+
+    units = []
+    for source in sources:
+        rel = os.path.relpath(source, root)
+        stem = os.path.join(build_dir, rel.replace("..", "_").replace(os.sep, "__"))
+        units.append((source, rel, stem + ".o", stem + ".d"))
+    stale = [unit for unit in units if not object_is_current(unit[0], unit[2], unit[3], root)]
+    report(f"Project: {len(units)} translation units, {len(stale)} to rebuild\n")
+
+    def compile_unit(unit):
+        source, rel, obj, depfile = unit
+        start = time.perf_counter()
+        result = run_compiler([compiler_path, "-c", source, "-o", obj, "-MMD", "-MF", depfile] + flags, root, on_output)
+        mark = "✓" if result.returncode == 0 else "❌"
+        report(f"  {mark} {rel} ({time.perf_counter() - start:.2f} s)\n")
+        return result
+
+    failed = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 2) as pool:
+        for result in pool.map(compile_unit, stale):
+            if result.returncode != 0:
+                failed.append(result)
+    if failed:
+        stderr = "".join(result.stderr for result in failed)
+        return exe, subprocess.CompletedProcess(None, failed[0].returncode, "", stderr)
+
+    objects = [unit[2] for unit in units]
+    link_list = os.path.join(build_dir, PROJECT_LINK_LIST)
+    try:
+        with open(link_list, "r", encoding="utf-8") as f:
+            linked = json.load(f)
+    except (OSError, ValueError):
+        linked = None
+    # A deleted or de-listed source leaves every remaining object current,
+    # so the executable is also stale whenever the object list changed
+    if (not stale and linked == objects and os.path.isfile(exe)
+            and os.path.getmtime(exe) >= max(map(os.path.getmtime, objects))):
+        report("  executable is up to date\n")
+        return exe, subprocess.CompletedProcess(None, 0, "", "")
+    start = time.perf_counter()
+    result = run_compiler([compiler_path] + objects + ["-o", exe], root, on_output)
+    if result.returncode == 0:
+        with open(link_list, "w", encoding="utf-8") as f:
+            json.dump(objects, f)
+        report(f"  linked {os.path.basename(exe)} ({time.perf_counter() - start:.2f} s)\n")
+    return exe, result
+
+
+# Background syntax check: g++ -fsyntax-only on a debounced snapshot of the
+# buffer, one job per tab, never more than syntax_check_max_jobs at once
+check_after_ids = {}   # tab id -> pending after() id
+check_jobs = {}        # tab id -> running job (until its process has exited)
+check_queue = []       # tab ids waiting for a free checker slot
+
+
+def cancel_syntax_check(tab_id):
+    after_id = check_after_ids.pop(tab_id, None)
+    if after_id:
+        app.after_cancel(after_id)
+    if tab_id in check_queue:
+        check_queue.remove(tab_id)
+    job = check_jobs.get(tab_id)
+    if job is not None:
+        job["cancelled"] = True
+        proc = job["process"]
+        if proc is not None and proc.poll() is None:
+            try:
+                proc.kill()
+            except OSError:
+                pass
+
+
+def schedule_syntax_check(tab):
+    cancel_syntax_check(tab["id"])
+    if not settings.get("syntax_check", True) or compiler_path is None:
+        return
+    check_after_ids[tab["id"]] = app.after(
+        int(settings.get("syntax_check_delay_ms", 800)),
+        lambda: queue_syntax_check(tab["id"])
+    )
+
+
+def queue_syntax_check(tab_id):
+    check_after_ids.pop(tab_id, None)
+    if tab_id not in check_queue:
+        check_queue.append(tab_id)
+    start_queued_checks()
+
+
+def start_queued_checks():
+    limit = max(1, int(settings.get("syntax_check_max_jobs", 1)))
+    for tab_id in list(check_queue):
+        if len(check_jobs) >= limit:
+            break
+        if tab_id in check_jobs:
+            # Its cancelled job is still exiting; it still holds a slot
+            continue
+        check_queue.remove(tab_id)
+        tab = tabs.get(tab_id)
+        if tab is not None and tab["editor"] is not None:
+            start_syntax_check(tab)
+
+
+def start_syntax_check(tab):
+    text = tab["editor"].get("1.0", "end-1c")
+    cwd = os.path.dirname(os.path.abspath(tab["path"])) if tab["path"] else os.getcwd()
+    command = [
+        compiler_path, "-fsyntax-only", f"-std=c++{settings['cpp_standard']}",
+        "-iquote", cwd, "-x", "c++", "-"
+    ]
+    job = {"process": None, "cancelled": False, "text_hash": hash(text)}
+    check_jobs[tab["id"]] = job
+
+    def worker():
+        diagnostics = []
+        try:
+            proc = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                encoding="utf-8",
+                errors="replace",
+                cwd=cwd,
+                env=mingw_env,
+                **compiler_process_options(background=True)
+            )
+            lower_priority(proc)
+            job["process"] = proc
+            if job["cancelled"]:
+                proc.kill()
+            output = proc.communicate(text)[0]
+            for line in output.splitlines():
+                match = DIAGNOSTIC_RE.match(line)
+                if match and match.group(1) == "<stdin>":
+                    severity = match.group(4)
+                    diagnostics.append({
+                        "line": int(match.group(2)),
+                        "column": int(match.group(3)),
+                        "severity": "error" if severity == "fatal error" else severity,
+                        "message": match.group(5)
+                    })
+        except Exception:
+            job["cancelled"] = True
+        app.after(0, lambda: finish_syntax_check(tab, job, diagnostics))
+
+    threading.Thread(target=worker, daemon=True).start()
+
+
+def finish_syntax_check(tab, job, diagnostics):
+    global diagnostic_version
+    if check_jobs.get(tab["id"]) is job:
+        del check_jobs[tab["id"]]
+    start_queued_checks()
+    if job["cancelled"] or tabs.get(tab["id"]) is not tab or tab["editor"] is None:
+        return
+    editor = tab["editor"]
+    if hash(editor.get("1.0", "end-1c")) != job["text_hash"]:
+        return
+
+    editor.tag_remove("check_error", "1.0", "end")
+    editor.tag_remove("check_warning", "1.0", "end")
+    marks = {}
+    messages = {}
+    for diag in diagnostics[:MAX_DIAGNOSTICS]:
+        severity = diag["severity"]
+        if severity == "note":
+            continue
+        start = f"{diag['line']}.{max(0, diag['column'] - 1)}"
+        end = f"{start} wordend"
+        if editor.compare(end, "<=", start):
+            end = f"{start}+1c"
+        editor.tag_add("check_" + severity, start, end)
+        if marks.get(diag["line"]) != "error":
+            marks[diag["line"]] = severity
+            messages[diag["line"]] = diag["message"]
+    tab["check_marks"] = marks
+    tab["check_messages"] = messages
+    if tab["id"] == active_tab:
+        diagnostic_version += 1
+        schedule_view_update()
+        show_check_message()
+
+
+def show_check_message(event=None):
+    """Show the checker's message for the cursor line in the status line"""
+    tab = tabs.get(active_tab)
+    if tab is None or not tab["check_messages"]:
+        return
+    line = int(code_editor.index("insert").split('.')[0])
+    message = tab["check_messages"].get(line)
+    if message:
+        set_editor_status(f"Line {line}: {message}")
+
+
+# Compiler diagnostics shown in the output panel (clickable) and the gutter
+diagnostic_lines = {}     # output_box line -> diagnostic
+diagnostic_marks = {}     # normcased file -> {line: severity}
+diagnostic_counts = {}
+diagnostic_version = 0
+compile_output_shown = 0
+
+
+def clear_diagnostics():
+    global diagnostic_version, compile_output_shown
+    diagnostic_lines.clear()
+    diagnostic_marks.clear()
+    diagnostic_counts.clear()
+    diagnostic_version += 1
+    compile_output_shown = 0
+    schedule_view_update()
+
+
+def active_diagnostic_marks():
+    """Gutter marks for the active tab: last Run's diagnostics plus the checker's"""
+    tab = tabs.get(active_tab)
+    if tab is None:
+        return {}
+    marks = {}
+    if diagnostic_marks and tab["path"] is not None:
+        marks.update(diagnostic_marks.get(os.path.normcase(os.path.abspath(tab["path"])), {}))
+    marks.update(tab["check_marks"])
+    return marks
+
+
+def show_compiler_output(batch):
+    """Append a batch of streamed compiler lines, tagging diagnostics as clickable"""
+    global compile_output_shown, diagnostic_version
+    marks_changed = False
+    output_box.configure(state="normal")
+    for line, diag in batch:
+        if diag is not None:
+            severity = diag["severity"]
+            diagnostic_counts[severity] = diagnostic_counts.get(severity, 0) + 1
+            if severity != "note":
+                marks = diagnostic_marks.setdefault(os.path.normcase(diag["file"]), {})
+                if marks.get(diag["line"]) != "error":
+                    marks[diag["line"]] = severity
+                    marks_changed = True
+        if compile_output_shown > COMPILE_OUTPUT_LIMIT:
+            continue
+        compile_output_shown += len(line)
+        if compile_output_shown > COMPILE_OUTPUT_LIMIT:
+            output_box.insert("end", "… compiler output truncated …\n")
+        elif diag is not None and len(diagnostic_lines) < MAX_DIAGNOSTICS:
+            row = int(output_box.index("end-1c").split('.')[0])
+            diagnostic_lines[row] = diag
+            output_box.insert("end", line, ("diagnostic", "diag_" + diag["severity"]))
+        else:
+            output_box.insert("end", line)
+    output_box.see("end")
+    output_box.configure(state="disabled")
+    if marks_changed:
+        diagnostic_version += 1
+        schedule_view_update()
+
+
+def open_diagnostic(diag):
+    path = os.path.normcase(diag["file"])
+    for tab in tabs.values():
+        if tab["path"] and os.path.normcase(os.path.abspath(tab["path"])) == path:
+            switch_tab(tab["id"])
+            break
+    else:
+        if not os.path.isfile(diag["file"]):
+            return
+        new_tab(path=diag["file"])
+        if tabs[active_tab]["path"] != diag["file"]:
+            return
+    code_editor.mark_set("insert", f"{diag['line']}.{max(0, diag['column'] - 1)}")
+    code_editor.see("insert")
+    code_editor.focus_set()
+    highlight_current_line()
+    schedule_view_update()
+
+
+def on_diagnostic_click(event):
+    row = int(output_box.index(f"@{event.x},{event.y}").split('.')[0])
+    diag = diagnostic_lines.get(row)
+    if diag is not None:
+        open_diagnostic(diag)
+
+
+# Program output pump: a reader thread collects stdout in large chunks and
+# the UI drains them at a fixed frame rate into a bounded scrollback
+OUTPUT_FRAME_MS = 33
+OUTPUT_READ_CHUNK = 64 * 1024
+OUTPUT_BUFFER_LIMIT = 8 * 1024 * 1024   # unread bytes before the reader stalls the program
+output_pump = None
+
+
+def start_output_pump(proc, on_finish, limits=None):
+    """Stream proc's stdout (a binary pipe) into output_box until it exits.
+
+    Meanwhile proc is held to limits (see wait_for_process), and on_finish
+    gets its usage.
+    """
+    global output_pump
+    if output_pump is not None:
+        output_pump["stopped"] = True
+    pump = {
+        "process": proc,
+        "on_finish": on_finish,
+        "chunks": [],
+        "pending": 0,
+        "lock": threading.Lock(),
+        "done": False,
+        "stopped": False,
+        "decoder": codecs.getincrementaldecoder(locale.getpreferredencoding(False))(errors="replace"),
+        "carry": "",
+        "bytes": 0,
+        "lines": 0,
+        "start": time.perf_counter(),
+        "usage": None
+    }
+    output_pump = pump
+    try:
+        log_file = create_run_log()
+    except OSError:
+        log_file = None
+
+    def account():
+        pump["usage"] = wait_for_process(proc, pump["start"], limits)
+
+    accountant = threading.Thread(target=account, daemon=True)
+    accountant.start()
+
+    def reader():
+        nonlocal log_file
+        try:
+            while True:
+                data = proc.stdout.read1(OUTPUT_READ_CHUNK)
+                if not data:
+                    break
+                if pump["stopped"]:
+                    continue   # superseded by a newer run: drain and discard
+                if log_file is not None:
+                    try:
+                        log_file.write(data)
+                    except OSError as e:
+                        # e.g. a full disk: drop the log but keep draining the pipe
+                        try:
+                            log_file.close()
+                        except OSError:
+                            pass
+                        log_file = None
+                        data += f"\n⚠ Run log stopped: {e}\n".encode("utf-8", "replace")
+                with pump["lock"]:
+                    pump["chunks"].append(data)
+                    pump["pending"] += len(data)
+                # Backpressure: leave the pipe full so the program blocks on write
+                while pump["pending"] > OUTPUT_BUFFER_LIMIT and not pump["stopped"]:
+                    time.sleep(0.005)
+        except Exception as e:
+            with pump["lock"]:
+                pump["chunks"].append(f"\n❌ Error: {e}\n".encode("utf-8", "replace"))
+        accountant.join()
+        if log_file is not None:
+            log_file.close()
+        # Under the lock, so a flush that sees done also sees the last chunk
+        with pump["lock"]:
+            pump["done"] = True
+
+    threading.Thread(target=reader, daemon=True).start()
+    app.after(OUTPUT_FRAME_MS, lambda: flush_output_pump(pump))
+
+
+def append_output_text(text):
+    """Insert text at the end of output_box, keeping at most output_max_lines"""
+    max_lines = max(100, int(settings.get("output_max_lines", 10000)))
+    new_lines = text.count("\n")
+    if new_lines >= max_lines:
+        # Everything already in the widget would be trimmed anyway
+        text = "\n".join(text.split("\n")[-max_lines - 1:])
+        output_box.delete("1.0", "end")
+        shift_diagnostic_lines(None)
+    output_box.insert("end", text)
+    excess = int(output_box.index("end-1c").split('.')[0]) - max_lines
+    if excess > 0:
+        output_box.delete("1.0", f"{excess + 1}.0")
+        shift_diagnostic_lines(excess)
+
+
+def shift_diagnostic_lines(count):
+    """Keep clickable diagnostics pointing at their rows after trimming `count` lines (None: all)"""
+    if not diagnostic_lines:
+        return
+    moved = {}
+    if count is not None:
+        moved = {row - count: diag for row, diag in diagnostic_lines.items() if row > count}
+    diagnostic_lines.clear()
+    diagnostic_lines.update(moved)
+
+
+def format_rate(value, unit):
+    if value < 1000:
+        return f"{value:.0f} {unit}"
+    for prefix in ("K", "M", "G"):
+        value /= 1000
+        if value < 1000 or prefix == "G":
+            return f"{value:.1f} {prefix}{unit}"
+
+
+def flush_output_pump(pump):
+    with pump["lock"]:
+        data = b"".join(pump["chunks"])
+        pump["chunks"].clear()
+        pump["pending"] = 0
+        done = pump["done"]
+
+    text = pump["decoder"].decode(data, final=done)
+    if text or (done and pump["carry"]):
+        text = pump["carry"] + text
+        pump["carry"] = ""
+        if text.endswith("\r") and not done:
+            # Could be the first half of a \r\n split across reads
+            pump["carry"] = "\r"
+            text = text[:-1]
+        text = text.replace("\r\n", "\n")
+        pump["bytes"] += len(data)
+        pump["lines"] += text.count("\n")
+        output_box.configure(state="normal")
+        append_output_text(text)
+        output_box.see("end")
+        output_box.configure(state="disabled")
+    elif data:
+        pump["bytes"] += len(data)
+
+    elapsed = max(time.perf_counter() - pump["start"], 1e-6)
+    output_stats.configure(text=(
+        f"{pump['lines']:,} lines, {format_rate(pump['bytes'], 'B')} · "
+        f"{format_rate(pump['lines'] / elapsed, 'lines/s')}, {format_rate(pump['bytes'] / elapsed, 'B/s')}"
+    ))
+
+    if done:
+        pump["on_finish"](pump["usage"])
+    elif not pump["stopped"]:
+        app.after(OUTPUT_FRAME_MS, lambda: flush_output_pump(pump))
+
+
+# Run logs: every in-app run's full output is also written to a log file,
+# which the "Full Log" viewer pages through with mmap and a line index
+LOG_DIR = user_cache_dir("logs")
+LOG_KEEP = 10
+LOG_INDEX_CHUNK = 8 * 1024 * 1024   # bytes indexed per UI tick
+LOG_POLL_MS = 250
+LOG_NEWLINE_RE = re.compile(b"\n")
+current_log_path = None
+log_view = {
+    "path": None,
+    "mmap": None,
+    "offsets": array.array("Q", [0]),   # byte offset of the start of every line
+    "indexed": 0,
+    "top": 0,
+    "follow": True,
+    "match": None,                      # (byte offset, byte length) of the search hit
+    "visible": False
+}
 
+
+def create_run_log():
+    """Open a new log file for a run, dropping the oldest logs beyond LOG_KEEP"""
+    global current_log_path
+    ensure_private_dir(LOG_DIR)
+    logs = sorted(
+        (os.path.join(LOG_DIR, name) for name in os.listdir(LOG_DIR) if name.endswith(".log")),
+        key=lambda path: os.path.getmtime(path)
+    )
+    for path in logs[:max(0, len(logs) - LOG_KEEP + 1)]:
+        if path != log_view["path"]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    fd, current_log_path = tempfile.mkstemp(prefix=time.strftime("run_%Y%m%d_%H%M%S_"), suffix=".log", dir=LOG_DIR)
+    return os.fdopen(fd, "wb", buffering=0)
+
+
+def open_log_view(path):
+    if log_view["mmap"] is not None:
+        log_view["mmap"].close()
+    log_view.update({
+        "path": path,
+        "mmap": None,
+        "offsets": array.array("Q", [0]),
+        "indexed": 0,
+        "top": 0,
+        "follow": True,
+        "match": None
+    })
+
+
+def refresh_log_index():
+    """Map the log again if it grew and index new lines; True if more is left to index"""
+    path = log_view["path"]
+    if path is None:
+        return False
+    mm = log_view["mmap"]
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return False
+    if size and (mm is None or size > len(mm)):
+        if mm is not None:
+            mm.close()
+        with open(path, "rb") as f:
+            mm = log_view["mmap"] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mm is None:
+        return False
+    start = log_view["indexed"]
+    end = min(len(mm), start + LOG_INDEX_CHUNK)
+    log_view["offsets"].extend(m.end() for m in LOG_NEWLINE_RE.finditer(mm, start, end))
+    log_view["indexed"] = end
+    return end < len(mm)
+
+
+def log_line_count():
+    offsets = log_view["offsets"]
+    if offsets[-1] == log_view["indexed"]:
+        return len(offsets) - 1   # no partial line after the last newline
+    return len(offsets)
+
+
+def log_page_rows():
+    linespace = int(log_text.tk.call("font", "metrics", log_text.cget("font"), "-linespace"))
+    return max(1, log_text.winfo_height() // max(1, linespace))
+
+
+def render_log_page():
+    mm = log_view["mmap"]
+    offsets = log_view["offsets"]
+    rows = log_page_rows()
+    total = log_line_count()
+    if log_view["follow"]:
+        log_view["top"] = total - rows
+    top = log_view["top"] = max(0, min(log_view["top"], total - rows))
+    encoding = locale.getpreferredencoding(False)
+
+    log_text.configure(state="normal")
+    log_text.delete("1.0", "end")
+    if mm is not None and total:
+        start = offsets[top]
+        end = offsets[top + rows] if top + rows < len(offsets) else log_view["indexed"]
+        log_text.insert("1.0", mm[start:end].decode(encoding, "replace").replace("\r\n", "\n"))
+        match = log_view["match"]
+        if match is not None and start <= match[0] < end:
+            line = bisect.bisect_right(offsets, match[0]) - 1
+            column = len(mm[offsets[line]:match[0]].decode(encoding, "replace"))
+            length = len(mm[match[0]:match[0] + match[1]].decode(encoding, "replace"))
+            index = f"{line - top + 1}.{column}"
+            log_text.tag_add("log_match", index, f"{index}+{length}c")
+    log_text.configure(state="disabled")
+    if total:
+        log_scroll.set(top / total, min(1.0, (top + rows) / total))
+    else:
+        log_scroll.set(0, 1)
+
+
+def scroll_log_to(top):
+    log_view["top"] = top
+    log_view["follow"] = top + log_page_rows() >= log_line_count()
+    render_log_page()
+
+
+def on_log_scroll(*args):
+    total = log_line_count()
+    if args[0] == "moveto":
+        scroll_log_to(int(float(args[1]) * total))
+    elif args[0] == "scroll":
+        step = int(args[1]) * (log_page_rows() if args[2] == "pages" else 1)
+        scroll_log_to(log_view["top"] + step)
+
+
+def on_log_wheel(event):
+    if event.num == 4 or event.delta > 0:
+        scroll_log_to(log_view["top"] - 3)
+    else:
+        scroll_log_to(log_view["top"] + 3)
+    return "break"
+
+
+def search_log(event=None, next_match=False):
+    """Find the search text in the mapped log, starting at the top line (or after the last hit)"""
+    needle = log_search.get()
+    mm = log_view["mmap"]
+    if not needle or mm is None:
+        log_view["match"] = None
+        render_log_page()
+        return
+    data = needle.encode(locale.getpreferredencoding(False), "replace")
+    if next_match and log_view["match"] is not None:
+        start = log_view["match"][0] + 1
+    else:
+        start = log_view["offsets"][min(log_view["top"], len(log_view["offsets"]) - 1)]
+    position = mm.find(data, start, log_view["indexed"])
+    if position < 0 and start > 0:
+        position = mm.find(data, 0, log_view["indexed"])
+    if position < 0:
+        log_view["match"] = None
+        output_stats.configure(text=f"'{needle}' not found in log")
+        render_log_page()
+        return
+    log_view["match"] = (position, len(data))
+    line = bisect.bisect_right(log_view["offsets"], position) - 1
+    log_view["top"] = max(0, line - 2)
+    log_view["follow"] = False
+    render_log_page()
+
+
+def poll_log_view():
+    if not log_view["visible"]:
+        return
+    more = refresh_log_index()
+    render_log_page()
+    app.after(1 if more else LOG_POLL_MS, poll_log_view)
+
+
+def toggle_log_view():
+    if log_view["visible"]:
+        log_view["visible"] = False
+        log_frame.pack_forget()
+        log_search.pack_forget()
+        output_box.pack(fill="both", expand=True, padx=10, pady=(0, 10), before=monitor_frame)
+        log_toggle.configure(text="Full Log")
+        return
+    if current_log_path is None:
+        output_stats.configure(text="No run log yet")
+        return
+    if log_view["path"] != current_log_path:
+        open_log_view(current_log_path)
+    log_view["visible"] = True
+    output_box.pack_forget()
+    log_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10), before=monitor_frame)
+    log_search.pack(side="left", fill="x", expand=True, padx=(5, 0))
+    log_toggle.configure(text="Back to Output")
+    poll_log_view()
+
+
+# Program input: "terminal" keeps the old external-console behaviour for
+# programs that read input; "inline"/"file" stream into the in-app process
+STDIN_CHUNK = 1024 * 1024
+INPUT_MODES = {"Terminal": "terminal", "Inline": "inline", "File": "file"}
+
+
+def start_stdin_writer(proc, source):
+    """Feed proc.stdin from ("inline", text) or ("file", path) on a thread, then close it.
+
+    Writes block while the pipe is full, so a huge input file is only ever
+    one chunk at a time in memory.
+    """
+    def writer():
+        try:
+            if source is None:
+                pass
+            elif source[0] == "inline":
+                data = source[1].encode(locale.getpreferredencoding(False), "replace")
+                for i in range(0, len(data), STDIN_CHUNK):
+                    proc.stdin.write(data[i:i + STDIN_CHUNK])
+            else:
+                with open(source[1], "rb") as f:
+                    while True:
+                        chunk = f.read(STDIN_CHUNK)
+                        if not chunk:
+                            break
+                        proc.stdin.write(chunk)
+        except (OSError, ValueError):
+            pass   # the program exited without reading all of its input
+        finally:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+
+    threading.Thread(target=writer, daemon=True).start()
+
+
+def set_input_mode(label):
+    mode = INPUT_MODES[label]
+    settings["input_mode"] = mode
+    input_text.pack_forget()
+    input_file_row.pack_forget()
+    if mode == "inline":
+        input_text.pack(fill="x", padx=10, pady=(0, 5), before=output_label)
+    elif mode == "file":
+        input_file_row.pack(fill="x", padx=10, pady=(0, 5), before=output_label)
+
+
+def browse_input_file():
+    path = filedialog.askopenfilename(title="Input File", filetypes=[("Text files", "*.txt *.in"), ("All files", "*.*")])
+    if path:
+        input_file_entry.delete(0, "end")
+        input_file_entry.insert(0, path)
+        settings["input_file"] = path
+
+
+def current_input_source():
+    """The selected input as a start_stdin_writer source, or None for no input"""
+    mode = settings.get("input_mode", "terminal")
+    if mode == "inline":
+        return ("inline", input_text.get("1.0", "end-1c"))
+    if mode == "file":
+        return ("file", input_file_entry.get().strip())
+    return None
+
+
+def prepare_run():
+    """Save the active tab and check it can be built; returns (tab, source, exe) or None"""
     if active_tab is None:
         messagebox.showwarning("No File", "No active file to run.")
-        return
+        return None
 
     tab = tabs[active_tab]
 
-    if tab["content"] != tab["saved_content"]:
-        if not save_current_tab():
-            return
+    if is_tab_modified(tab):
+        # No background build: Run compiles it right away, in the foreground
+        # and with streamed diagnostics, instead of waiting on a niced one
+        if not save_current_tab(speculate=False):
+            return None
 
     if tab["path"] is None:
         messagebox.showwarning("Save Required", "Please save the file before running.")
-        return
-
-    source_file = os.path.abspath(tab["path"])
-    output_exe = os.path.splitext(source_file)[0] + ".exe"
+        return None
 
     # Use pre-detected compiler
     if compiler_path is None:
@@ -1262,21 +3621,820 @@ def run_code():
                            "No compiler found!\n"
                            "Please install g++ (MinGW) and add it to your PATH,\n"
                            "or place the bundled MinGW in the 'compilers/mingw64' folder.")
+        return None
+
+    source_file = os.path.abspath(tab["path"])
+    return tab, source_file, os.path.splitext(source_file)[0] + ".exe"
+
+
+def build_executable(tab, source_file, output_exe, compile_flags, on_output):
+    """Build output_exe: project build, build cache / background build, or a plain compile.
+
+    Returns (executable, report) where report is ("compiled", CompletedProcess,
+    compile time, notes) or ("cached", cached compile time, lookup time,
+    attached to a background build).
+    """
+    if settings.get("project_mode", False):
+        start = time.perf_counter()
+        output_exe, result = build_project(source_file, compile_flags, on_output)
+        return output_exe, ("compiled", result, time.perf_counter() - start, ["project build"])
+
+    key = None
+    if settings.get("build_cache", True):
+        start = time.perf_counter()
+        key = build_cache_key(source_file, compile_flags)
+        attached = wait_for_speculative_build(tab["id"], key)
+        cached_exe, cached_time = build_cache_lookup(key)
+        if cached_exe:
+            try:
+                shutil.copy2(cached_exe, output_exe)
+            except OSError:
+                # The old .exe may still be running; use the cached copy directly
+                output_exe = cached_exe
+            return output_exe, ("cached", cached_time, time.perf_counter() - start, attached)
+
+    result, compile_time, notes = compile_source(source_file, output_exe, compile_flags, key=key, on_output=on_output)
+    return output_exe, ("compiled", result, compile_time, notes)
+
+
+def format_bytes(value):
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+
+
+# Run limits (0 = none): a watchdog polls the process tree with psutil and
+# kills all of it when a limit is passed; on Linux CPU time is also an
+# rlimit, so the kernel stops a runaway between polls. Memory is only
+# checked against the tree's RSS: an address-space rlimit would count
+# reserved but untouched memory (thread stacks, arenas) and its failures
+# cannot be told apart from ordinary crashes
+LIMIT_POLL_S = 0.01
+LIMIT_TREE_EVERY = 10   # polls between rescans for child processes
+LIMIT_NAMES = {"wall": "wall time", "cpu": "CPU time", "memory": "memory"}
+
+
+def current_run_limits():
+    return {
+        "wall": float(settings.get("run_wall_limit_s", 0)),
+        "cpu": float(settings.get("run_cpu_limit_s", 0)),
+        "memory": int(settings.get("run_memory_limit_mb", 0)) * 1024 * 1024
+    }
+
+
+def describe_limit(limit, limits):
+    value = format_bytes(limits[limit]) if limit == "memory" else f"{limits[limit]:g} s"
+    return f"{LIMIT_NAMES[limit]} limit ({value}) exceeded"
+
+
+def kill_process_tree(pid):
+    """Kill pid and everything it started"""
+    try:
+        parent = psutil.Process(pid)
+        victims = [parent] + parent.children(recursive=True)
+    except psutil.Error:
+        return
+    for victim in victims:
+        try:
+            victim.kill()
+        except psutil.Error:
+            pass
+
+
+def apply_rlimits(pid, limits):
+    """Set the CPU limit as an rlimit of a just-started Linux process"""
+    if not hasattr(psutil, "RLIMIT_CPU") or not limits.get("cpu"):
+        return
+    try:
+        # SIGXCPU at the soft limit, SIGKILL a second later if that is ignored
+        cpu = int(limits["cpu"] + 0.999)
+        psutil.Process(pid).rlimit(psutil.RLIMIT_CPU, (cpu, cpu + 1))
+    except (psutil.Error, OSError, ValueError):
+        pass
+
+
+def read_memory_peak(pid):
+    """VmHWM of a live Linux process in bytes, 0 if it is gone"""
+    try:
+        with open(f"/proc/{pid}/status", "rb") as f:
+            for line in f:
+                if line.startswith(b"VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def wait_for_process(proc, start, limits=None):
+    """Wait for proc (started at perf_counter() == start), enforcing limits and accounting for it.
+
+    limits maps "wall"/"cpu" (seconds) and "memory" (bytes) to a bound, 0 for
+    none. Returns {"returncode", "wall", "user", "sys", "peak_rss", "limit"},
+    limit naming the bound that stopped the program, if any.
+
+    On POSIX the child is reaped with wait4, which gives exact CPU times; on
+    Linux peak_rss is VmHWM as last polled (0 if the program exited first).
+    Elsewhere CPU times and peak_wset come from the last poll.
+    """
+    limits = limits or {}
+    usage = {"returncode": None, "wall": 0.0, "user": 0.0, "sys": 0.0, "peak_rss": 0, "limit": None}
+    linux = sys.platform.startswith("linux")
+    reaps = hasattr(os, "wait4")
+    if linux:
+        apply_rlimits(proc.pid, limits)
+    try:
+        root = psutil.Process(proc.pid)
+    except psutil.Error:
+        root = None
+    done = threading.Event()
+
+    def exceeded(limit):
+        if usage["limit"] is None:
+            usage["limit"] = limit
+        kill_process_tree(proc.pid)
+
+    def sample():
+        if linux:
+            # ru_maxrss also counts this process's own peak from before the
+            # exec, so use the child's high-water mark instead
+            usage["peak_rss"] = max(usage["peak_rss"], read_memory_peak(proc.pid))
+        times = root.cpu_times()
+        memory = root.memory_info()
+        if not reaps:
+            usage["user"], usage["sys"] = times.user, times.system
+            usage["peak_rss"] = max(usage["peak_rss"], getattr(memory, "peak_wset", memory.rss))
+        return times.user + times.system, memory.rss
+
+    def watch():
+        children = []
+        polls = 0
+        while not done.is_set():
+            try:
+                if polls % LIMIT_TREE_EVERY == 0:
+                    children = root.children(recursive=True)
+                tree_cpu, tree_rss = sample()
+                for child in children:
+                    try:
+                        child_times = child.cpu_times()
+                        tree_cpu += child_times.user + child_times.system
+                        tree_rss += child.memory_info().rss
+                    except psutil.Error:
+                        pass
+                if limits.get("wall") and time.perf_counter() - start > limits["wall"]:
+                    exceeded("wall")
+                elif limits.get("cpu") and tree_cpu > limits["cpu"]:
+                    exceeded("cpu")
+                elif limits.get("memory") and tree_rss > limits["memory"]:
+                    exceeded("memory")
+            except psutil.Error:
+                pass   # exited, not reaped yet
+            polls += 1
+            done.wait(LIMIT_POLL_S)
+
+    if root is not None:
+        threading.Thread(target=watch, daemon=True).start()
+    try:
+        if reaps:
+            _, status, rusage = os.wait4(proc.pid, 0)
+            usage["wall"] = time.perf_counter() - start
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            usage["user"], usage["sys"] = rusage.ru_utime, rusage.ru_stime
+            if not linux:
+                # ru_maxrss is in KB on Linux and the BSDs but in bytes on macOS
+                usage["peak_rss"] = rusage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+        else:
+            proc.wait()
+            usage["wall"] = time.perf_counter() - start
+            if root is not None:
+                try:
+                    sample()
+                except psutil.Error:
+                    pass
+    finally:
+        done.set()
+    usage["returncode"] = proc.returncode
+
+    if linux and usage["limit"] is None and limits.get("cpu") and proc.returncode in (-signal.SIGXCPU, -signal.SIGKILL):
+        # The kernel enforced RLIMIT_CPU before the watchdog saw it
+        if usage["user"] + usage["sys"] >= limits["cpu"] - 0.1:
+            usage["limit"] = "cpu"
+    return usage
+
+
+def format_usage(usage):
+    peak = format_bytes(usage["peak_rss"]) if usage["peak_rss"] else "-"
+    return f"wall {usage['wall']:.3f} s · user {usage['user']:.3f} s · sys {usage['sys']:.3f} s · peak RSS {peak}"
+
+
+# Resource monitor: samples the running program's process tree into a ring
+# buffer and draws CPU% and RSS as sparklines under the output panel
+MONITOR_FIELDS = ("time_s", "cpu_percent", "rss_bytes", "read_bytes", "write_bytes", "threads")
+MONITOR_CPU_COLOR = "#8be9fd"
+MONITOR_RSS_COLOR = "#ffb86c"
+monitor = None
+
+
+def sample_process_tree(processes):
+    """Total (CPU seconds, RSS, read bytes, write bytes, threads) over processes.
+
+    Processes that have exited are dropped from the dict; returns None once
+    the root (the first entry) is gone.
+    """
+    cpu = rss = read = write = threads = 0
+    for index, (pid, proc) in enumerate(list(processes.items())):
+        try:
+            with proc.oneshot():
+                times = proc.cpu_times()
+                cpu += times.user + times.system
+                rss += proc.memory_info().rss
+                threads += proc.num_threads()
+        except psutil.Error:
+            if index == 0:
+                return None
+            del processes[pid]
+            continue
+        try:
+            io = proc.io_counters()
+            read += io.read_bytes
+            write += io.write_bytes
+        except (psutil.Error, AttributeError):
+            pass   # not available on macOS
+    return cpu, rss, read, write, threads
+
+
+def start_resource_monitor(proc):
+    """Sample proc and its children every monitor_interval_ms until it exits"""
+    global monitor
+    if monitor is not None:
+        monitor["stopped"] = True
+    state = {
+        "samples": collections.deque(maxlen=max(10, int(settings.get("monitor_samples", 1500)))),
+        "interval": max(20, int(settings.get("monitor_interval_ms", 200))) / 1000,
+        "stopped": False,
+        "running": True
+    }
+    monitor = state
+    monitor_export.configure(state="disabled")
+
+    def sampler():
+        try:
+            processes = {proc.pid: psutil.Process(proc.pid)}
+        except psutil.Error:
+            processes = None
+        start = last_time = time.perf_counter()
+        last_cpu = 0.0
+        polls = 0
+        while processes is not None and not state["stopped"] and proc.returncode is None:
+            if polls % LIMIT_TREE_EVERY == 0:
+                try:
+                    for child in processes[proc.pid].children(recursive=True):
+                        processes.setdefault(child.pid, child)
+                except psutil.Error:
+                    break
+            totals = sample_process_tree(processes)
+            if totals is None:
+                break
+            now = time.perf_counter()
+            cpu, rss, read, write, threads = totals
+            # Exited children take their CPU time with them, so clamp at 0
+            cpu_percent = max(0.0, (cpu - last_cpu) / max(now - last_time, 1e-6) * 100)
+            state["samples"].append((now - start, cpu_percent, rss, read, write, threads))
+            last_time, last_cpu = now, cpu
+            polls += 1
+            time.sleep(state["interval"])
+        state["running"] = False
+
+    threading.Thread(target=sampler, daemon=True).start()
+    app.after(int(state["interval"] * 1000), lambda: draw_resource_monitor(state))
+
+
+def draw_resource_monitor(state):
+    if state is not monitor:
+        return
+    samples = list(state["samples"])
+    monitor_canvas.delete("all")
+    width = max(monitor_canvas.winfo_width(), 2)
+    height = max(monitor_canvas.winfo_height(), 10)
+
+    if len(samples) >= 2:
+        # One point per pixel at most
+        shown = samples[::max(1, len(samples) // width)]
+        for index, top, color in (
+            (2, max(1, max(sample[2] for sample in shown)), MONITOR_RSS_COLOR),
+            (1, max(100.0, max(sample[1] for sample in shown)), MONITOR_CPU_COLOR)
+        ):
+            points = []
+            for i, sample in enumerate(shown):
+                points.append(i * (width - 1) / (len(shown) - 1))
+                points.append(height - 2 - sample[index] / top * (height - 14))
+            monitor_canvas.create_line(*points, fill=color)
+
+    if samples:
+        if state["running"]:
+            latest = samples[-1]
+            text = (f"CPU {latest[1]:.0f}%  RSS {format_bytes(latest[2])}  threads {latest[5]}  "
+                    f"read {format_bytes(latest[3])}  written {format_bytes(latest[4])}")
+        else:
+            text = (f"peak CPU {max(s[1] for s in samples):.0f}%  peak RSS {format_bytes(max(s[2] for s in samples))}  "
+                    f"max threads {max(s[5] for s in samples)}  read {format_bytes(samples[-1][3])}  "
+                    f"written {format_bytes(samples[-1][4])}  ({len(samples)} samples)")
+        monitor_canvas.create_text(4, 1, anchor="nw", text=text, fill="gray", font=("Arial", 9))
+        monitor_canvas.create_text(width - 4, 1, anchor="ne", text="RSS", fill=MONITOR_RSS_COLOR, font=("Arial", 9))
+        monitor_canvas.create_text(width - 34, 1, anchor="ne", text="CPU", fill=MONITOR_CPU_COLOR, font=("Arial", 9))
+
+    if state["running"]:
+        app.after(int(state["interval"] * 1000), lambda: draw_resource_monitor(state))
+    else:
+        monitor_export.configure(state="normal" if samples else "disabled")
+
+
+def export_monitor_csv():
+    if monitor is None or not monitor["samples"]:
+        return
+    samples = list(monitor["samples"])
+    path = filedialog.asksaveasfilename(
+        title="Export Resource Samples", defaultextension=".csv",
+        initialfile="resources.csv", filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+    )
+    if not path:
+        return
+    try:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(MONITOR_FIELDS)
+            for t, cpu_percent, rss, read, write, threads in samples:
+                writer.writerow((f"{t:.3f}", f"{cpu_percent:.1f}", rss, read, write, threads))
+    except OSError as e:
+        messagebox.showerror("Export Failed", str(e))
+
+
+# Test cases: NAME.in with NAME.out (or NAME.ans), next to the source or in tests/
+TEST_CASE_DIRS = ("", "tests")
+TEST_ANSWER_EXTS = (".out", ".ans")
+TEST_COMPARE_MODES = {"Exact": "exact", "Ignore whitespace": "whitespace", "Floats (epsilon)": "float"}
+TEST_VERDICT_COLORS = {"AC": "#50fa7b", "WA": "#ff5555", "RE": "#ff79c6", "TLE": "#ffb86c", "MLE": "#bd93f9", "SKIP": "#888888"}
+COMPARE_CHUNK = 64 * 1024
+# Plain decimal numbers only: float() would also take 1_0, nan and inf
+NUMBER_TOKEN_RE = re.compile(rb"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+test_run = None   # {"cancelled": ...} while tests are running
+
+
+def discover_test_cases(source_file):
+    """(name, input, answer) for every test pair, in natural name order"""
+    root = os.path.dirname(source_file)
+    cases = []
+    for sub in TEST_CASE_DIRS:
+        folder = os.path.join(root, sub)
+        try:
+            names = os.listdir(folder)
+        except OSError:
+            continue
+        for name in names:
+            stem, ext = os.path.splitext(name)
+            if ext.lower() != ".in":
+                continue
+            for answer_ext in TEST_ANSWER_EXTS:
+                answer = os.path.join(folder, stem + answer_ext)
+                if os.path.isfile(answer):
+                    cases.append((os.path.join(sub, stem) if sub else stem, os.path.join(folder, name), answer))
+                    break
+    cases.sort(key=lambda case: [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", case[0])])
+    return cases
+
+
+def read_tokens(f):
+    """Yield whitespace-separated tokens from binary file f, a chunk at a time"""
+    carry = b""
+    while True:
+        chunk = f.read(COMPARE_CHUNK)
+        if not chunk:
+            break
+        parts = (carry + chunk).split()
+        # A token running up to the end of the chunk may continue in the next one
+        carry = parts.pop() if parts and not chunk[-1:].isspace() else b""
+        yield from parts
+    if carry:
+        yield carry
+
+
+def tokens_match(got, expected, epsilon):
+    if got == expected:
+        return True
+    if epsilon is None or not (NUMBER_TOKEN_RE.fullmatch(got) and NUMBER_TOKEN_RE.fullmatch(expected)):
+        return False
+    got, expected = float(got), float(expected)
+    return abs(got - expected) <= epsilon * max(1.0, abs(expected))
+
+
+def compare_output(output_path, answer_path, mode="whitespace", epsilon=1e-6):
+    """Stream both files; None if they match, else a description of the first difference.
+
+    "exact" compares lines, ignoring line endings and trailing blank lines;
+    "whitespace" compares tokens; "float" also accepts numeric tokens within
+    epsilon (absolute, or relative for values above 1).
+    """
+    def preview(data):
+        return repr(data[:40].decode("utf-8", "replace") + ("…" if len(data) > 40 else ""))
+
+    with open(output_path, "rb") as out, open(answer_path, "rb") as answer:
+        if mode == "exact":
+            for number, (got, expected) in enumerate(itertools.zip_longest(out, answer, fillvalue=b""), 1):
+                got, expected = got.rstrip(b"\r\n"), expected.rstrip(b"\r\n")
+                if got != expected:
+                    return f"line {number}: got {preview(got)}, expected {preview(expected)}"
+            return None
+
+        epsilon = epsilon if mode == "float" else None
+        for number, (got, expected) in enumerate(itertools.zip_longest(read_tokens(out), read_tokens(answer)), 1):
+            if got is None:
+                return f"output ended at token {number}, expected {preview(expected)}"
+            if expected is None:
+                return f"extra output at token {number}: {preview(got)}"
+            if not tokens_match(got, expected, epsilon):
+                return f"token {number}: got {preview(got)}, expected {preview(expected)}"
+        return None
+
+
+def run_test_case(run, exe, index, case, scratch):
+    """Run one case and return (name, verdict, usage or None, detail)"""
+    name, input_path, answer_path = case
+    if run["cancelled"]:
+        return name, "SKIP", None, "cancelled"
+    output_path = os.path.join(scratch, f"{index}.out")
+    with open(input_path, "rb") as stdin, open(output_path, "wb") as stdout:
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [exe], stdin=stdin, stdout=stdout, stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(exe), env=mingw_env, **compiler_process_options()
+        )
+        usage = wait_for_process(proc, start, run["limits"])
+    if usage["limit"] is not None:
+        verdict = "MLE" if usage["limit"] == "memory" else "TLE"
+        return name, verdict, usage, describe_limit(usage["limit"], run["limits"])
+    if usage["returncode"] != 0:
+        return name, "RE", usage, f"exit code {usage['returncode']}"
+    difference = compare_output(output_path, answer_path, run["mode"], run["epsilon"])
+    os.remove(output_path)
+    return name, "AC" if difference is None else "WA", usage, difference or ""
+
+
+def run_tests():
+    """Build the active file and run it against its test cases on a process pool"""
+    global test_run
+    if test_run is not None:
+        # The button doubles as Stop: cases not started yet are skipped
+        test_run["cancelled"] = True
+        return
+
+    target = prepare_run()
+    if target is None:
+        return
+    tab, source_file, output_exe = target
+
+    cases = discover_test_cases(source_file)
+    if not cases:
+        messagebox.showinfo("No Test Cases",
+                            "No test cases found.\n"
+                            "Put NAME.in / NAME.out (or .ans) pairs next to the source file or in a 'tests' folder.")
         return
 
+    if output_pump is not None:
+        output_pump["stopped"] = True
+    output_box.configure(state="normal")
+    output_box.delete("1.0", "end")
+    clear_diagnostics()
+    output_stats.configure(text="")
+    workers = max(1, min(len(cases), os.cpu_count() or 1))
+    output_box.insert("end", f"TESTING {os.path.basename(source_file)}: {len(cases)} cases, {workers} at a time\n\n⏳ Compiling...\n")
+    output_box.configure(state="disabled")
+
+    run = {
+        "cancelled": False,
+        "mode": settings.get("test_compare_mode", "whitespace"),
+        "epsilon": float(settings.get("test_float_epsilon", 1e-6)),
+        "limits": dict(current_run_limits(), wall=float(settings.get("test_time_limit_s", 10))),
+        "results": []
+    }
+    test_run = run
+    tests_button.configure(text="Stop Tests")
+    compile_flags = current_compile_flags()
+    name_width = max(len("Case"), max(len(case[0]) for case in cases))
+
+    def stream_output(batch):
+        app.after(0, lambda: show_compiler_output(batch))
+
+    def worker():
+        try:
+            exe, report = build_executable(tab, source_file, output_exe, compile_flags, stream_output)
+            if report[0] == "compiled" and report[1].returncode != 0:
+                app.after(0, lambda: finish_tests("\n❌ COMPILATION FAILED\n"))
+                return
+            app.after(0, show_table_header)
+            scratch = tempfile.mkdtemp(prefix="runpp_tests_")
+            try:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                    futures = [pool.submit(run_test_case, run, exe, i, case, scratch) for i, case in enumerate(cases)]
+                    for future in concurrent.futures.as_completed(futures):
+                        row = future.result()
+                        app.after(0, lambda row=row: show_test_row(row))
+            finally:
+                shutil.rmtree(scratch, ignore_errors=True)
+            app.after(0, lambda: finish_tests(None))
+        except Exception as e:
+            app.after(0, lambda e=e: finish_tests(f"\n❌ Error: {e}\n"))
+
+    def show_table_header():
+        output_box.configure(state="normal")
+        output_box.insert("end", f"{'Case':<{name_width}}  Verdict      Wall       CPU   Peak RSS\n")
+        output_box.configure(state="disabled")
+
+    def show_test_row(row):
+        name, verdict, usage, detail = row
+        run["results"].append(row)
+        if usage is None:
+            numbers = f"{'-':>9} {'-':>9} {'-':>10}"
+        else:
+            peak = format_bytes(usage["peak_rss"]) if usage["peak_rss"] else "-"
+            numbers = f"{usage['wall']:>8.3f}s {usage['user'] + usage['sys']:>8.3f}s {peak:>10}"
+        output_box.configure(state="normal")
+        output_box.insert("end", f"{name:<{name_width}}  ")
+        output_box.insert("end", f"{verdict:<7}", "verdict_" + verdict)
+        output_box.insert("end", f" {numbers}  {detail}\n")
+        output_box.see("end")
+        output_box.configure(state="disabled")
+
+    def finish_tests(error):
+        global test_run
+        test_run = None
+        tests_button.configure(text="Run Tests")
+        output_box.configure(state="normal")
+        if error:
+            output_box.insert("end", error)
+        else:
+            results = run["results"]
+            passed = sum(1 for row in results if row[1] == "AC")
+            measured = [row for row in results if row[2] is not None]
+            summary = f"\n{'✓' if passed == len(results) else '❌'} Passed {passed}/{len(results)}"
+            if measured:
+                slowest = max(measured, key=lambda row: row[2]["wall"])
+                summary += (f" · slowest {slowest[0]} {slowest[2]['wall']:.3f} s"
+                            f" · max RSS {format_bytes(max(row[2]['peak_rss'] for row in measured))}")
+            output_box.insert("end", summary + "\n")
+        output_box.see("end")
+        output_box.configure(state="disabled")
+
+    threading.Thread(target=worker, daemon=True).start()
+
+
+# Benchmarks: repeated runs of the built executable, kept per source file
+# and flag set so each result can be compared with earlier ones
+BENCHMARK_HISTORY_FILE = resource_path("benchmark_history.json")
+BENCHMARK_HISTORY_KEEP = 50   # results kept per source file and flag set
+benchmark_run = None   # {"cancelled": ...} while a benchmark is running
+last_benchmark = None   # (history key, result) of the latest finished benchmark
+
+
+def benchmark_key(source_file, flags):
+    return hashlib.sha256(f"{os.path.normcase(source_file)}\0{chr(0).join(flags)}".encode("utf-8")).hexdigest()[:16]
+
+
+def load_benchmark_history():
+    try:
+        with open(BENCHMARK_HISTORY_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_benchmark_history(history):
+    temp_path = BENCHMARK_HISTORY_FILE + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+    os.replace(temp_path, BENCHMARK_HISTORY_FILE)
+
+
+def summarize_times(values):
+    return {
+        "min": min(values),
+        "median": statistics.median(values),
+        "mean": statistics.fmean(values),
+        "stdev": statistics.stdev(values) if len(values) > 1 else 0.0
+    }
+
+
+def compare_benchmarks(new, old):
+    """(description, "regression" / "improvement" / None) for the change in median wall time"""
+    before, after = old["wall"]["median"], new["wall"]["median"]
+    change = (after - before) / before * 100 if before else 0.0
+    # Differences inside two standard deviations (or 1%) are noise
+    if abs(after - before) <= max(2 * max(old["wall"]["stdev"], new["wall"]["stdev"]), before * 0.01):
+        return f"≈ {change:+.1f}%, within noise", None
+    if after > before:
+        return f"▲ {change:+.1f}% slower: regression", "regression"
+    return f"▼ {change:+.1f}% faster: improvement", "improvement"
+
+
+def set_benchmark_baseline():
+    """Make the latest benchmark the baseline its file and flags are compared against"""
+    if last_benchmark is None:
+        return
+    key, result = last_benchmark
+    history = load_benchmark_history()
+    if key not in history:
+        return
+    history[key]["baseline"] = result
+    try:
+        save_benchmark_history(history)
+    except OSError as e:
+        messagebox.showerror("Benchmark History", f"Could not save the baseline:\n{e}")
+        return
+    baseline_button.configure(state="disabled")
+    output_box.configure(state="normal")
+    output_box.insert("end", f"⚑ Baseline set to the benchmark of {result['time']}\n")
+    output_box.see("end")
+    output_box.configure(state="disabled")
+
+
+def run_benchmark():
+    """Build the active file and time benchmark_runs runs of it after benchmark_warmup untimed ones"""
+    global benchmark_run
+    if benchmark_run is not None:
+        benchmark_run["cancelled"] = True
+        return
+
+    target = prepare_run()
+    if target is None:
+        return
+    tab, source_file, output_exe = target
+
+    input_source = current_input_source()
+    if input_source and input_source[0] == "file" and not os.path.isfile(input_source[1]):
+        messagebox.showerror("Input File", f"Input file not found:\n{input_source[1] or '(none selected)'}")
+        return
+
+    runs = max(1, int(settings.get("benchmark_runs", 10)))
+    warmup = max(0, int(settings.get("benchmark_warmup", 1)))
+    pin_core = None
+    if settings.get("benchmark_pin_cpu", False) and hasattr(psutil.Process, "cpu_affinity"):
+        try:
+            # The last allowed core usually sees the least OS and UI work
+            pin_core = psutil.Process().cpu_affinity()[-1]
+        except (psutil.Error, IndexError):
+            pass
+
+    if output_pump is not None:
+        output_pump["stopped"] = True
+    output_box.configure(state="normal")
+    output_box.delete("1.0", "end")
+    clear_diagnostics()
+    output_stats.configure(text="")
+    details = f"{runs} runs after {warmup} warmup" + (f", pinned to CPU {pin_core}" if pin_core is not None else "")
+    output_box.insert("end", f"BENCHMARK {os.path.basename(source_file)}: {details}\n\n⏳ Compiling...\n")
+    output_box.configure(state="disabled")
+
+    run = {"cancelled": False}
+    benchmark_run = run
+    benchmark_button.configure(text="Stop")
+    baseline_button.configure(state="disabled")
+    compile_flags = current_compile_flags()
+    limits = current_run_limits()
+
+    def stream_output(batch):
+        app.after(0, lambda: show_compiler_output(batch))
+
+    def report(text):
+        def insert():
+            output_box.configure(state="normal")
+            output_box.insert("end", text)
+            output_box.see("end")
+            output_box.configure(state="disabled")
+        app.after(0, insert)
+
+    def run_once(exe):
+        if input_source is not None and input_source[0] == "file":
+            stdin = open(input_source[1], "rb")
+        else:
+            stdin = subprocess.PIPE if input_source is not None else subprocess.DEVNULL
+        try:
+            start = time.perf_counter()
+            proc = subprocess.Popen(
+                [exe], stdin=stdin, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                cwd=os.path.dirname(exe), env=mingw_env, **compiler_process_options()
+            )
+            if pin_core is not None:
+                try:
+                    psutil.Process(proc.pid).cpu_affinity([pin_core])
+                except psutil.Error:
+                    pass
+            if stdin is subprocess.PIPE:
+                start_stdin_writer(proc, input_source)
+            return wait_for_process(proc, start, limits)
+        finally:
+            if stdin not in (subprocess.PIPE, subprocess.DEVNULL):
+                stdin.close()
+
+    def worker():
+        try:
+            exe, build = build_executable(tab, source_file, output_exe, compile_flags, stream_output)
+            if build[0] == "compiled" and build[1].returncode != 0:
+                app.after(0, lambda: finish_benchmark("\n❌ COMPILATION FAILED\n"))
+                return
+            report("✓ Build ready\n\n")
+            samples = []
+            for i in range(warmup + runs):
+                if run["cancelled"]:
+                    app.after(0, lambda: finish_benchmark("\n⛔ Benchmark stopped\n"))
+                    return
+                usage = run_once(exe)
+                if usage["limit"] is not None or usage["returncode"] != 0:
+                    reason = describe_limit(usage["limit"], limits) if usage["limit"] else f"exit code {usage['returncode']}"
+                    app.after(0, lambda: finish_benchmark(f"\n❌ Run {i + 1} failed: {reason}\n"))
+                    return
+                cpu = usage["user"] + usage["sys"]
+                if i < warmup:
+                    report(f"warmup {i + 1}/{warmup}   wall {usage['wall']:.4f} s   CPU {cpu:.4f} s\n")
+                else:
+                    samples.append(usage)
+                    report(f"run {i - warmup + 1:>3}/{runs}   wall {usage['wall']:.4f} s   CPU {cpu:.4f} s\n")
+
+            result = {
+                "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "runs": runs,
+                "warmup": warmup,
+                "pinned": pin_core is not None,
+                "wall": summarize_times([u["wall"] for u in samples]),
+                "cpu": summarize_times([u["user"] + u["sys"] for u in samples])
+            }
+            key = benchmark_key(source_file, compile_flags)
+            history = load_benchmark_history()
+            entry = history.setdefault(key, {"source": source_file, "flags": compile_flags, "baseline": None, "results": []})
+            previous = entry["results"][-1] if entry["results"] else None
+            entry["results"] = (entry["results"] + [result])[-BENCHMARK_HISTORY_KEEP:]
+            try:
+                save_benchmark_history(history)
+            except OSError as e:
+                report(f"⚠️ Could not save benchmark history: {e}\n")
+            app.after(0, lambda: show_benchmark_result(key, result, previous, entry["baseline"]))
+        except Exception as e:
+            app.after(0, lambda e=e: finish_benchmark(f"\n❌ Error: {e}\n"))
+
+    def show_benchmark_result(key, result, previous, baseline):
+        global last_benchmark
+        last_benchmark = (key, result)
+        output_box.configure(state="normal")
+        output_box.insert("end", f"\n{'':<6}{'min':>10}{'median':>10}{'mean':>10}{'stddev':>10}\n")
+        for label, name in (("wall", "wall"), ("CPU", "cpu")):
+            stats = result[name]
+            output_box.insert("end", f"{label:<6}" + "".join(f"{stats[s]:>9.4f}s" for s in ("min", "median", "mean", "stdev")) + "\n")
+        for title, old in (("previous run", previous), ("baseline", baseline)):
+            if old is None:
+                continue
+            text, tag = compare_benchmarks(result, old)
+            output_box.insert("end", f"\nvs {title} ({old['time']}): median wall {old['wall']['median']:.4f} s → {result['wall']['median']:.4f} s  ")
+            output_box.insert("end", text, *(["bench_" + tag] if tag else []))
+        if previous is None:
+            output_box.insert("end", "\nFirst benchmark for this file and flag set")
+        output_box.insert("end", "\n")
+        output_box.configure(state="disabled")
+        finish_benchmark(None)
+        baseline_button.configure(state="normal")
+
+    def finish_benchmark(error):
+        global benchmark_run
+        benchmark_run = None
+        benchmark_button.configure(text="Benchmark")
+        if error:
+            report(error)
+
+    threading.Thread(target=worker, daemon=True).start()
+
+
+def run_code():
+    global process
+
+    target = prepare_run()
+    if target is None:
+        return
+    tab, source_file, output_exe = target
+
+    compile_flags = current_compile_flags()
     compile_cmd = [
         compiler_path,
         source_file,
-        "-o", output_exe,
-        f"-std=c++{settings['cpp_standard']}"
-    ]
+        "-o", output_exe
+    ] + compile_flags
 
     # Show initial message
     output_box.configure(state="normal")
     output_box.delete("1.0", "end")
+    clear_diagnostics()
 
     compiler_name = "System g++" if use_system_gpp else "Bundled MinGW g++"
-    if settings.get("show_compiler_cmd", True):
+    project_mode = settings.get("project_mode", False)
+    if project_mode:
+        output_box.insert("end", f"BUILDING PROJECT IN {os.path.dirname(source_file)} WITH {compiler_name}\n\n")
+    elif settings.get("show_compiler_cmd", True):
         output_box.insert("end", f"COMPILING WITH {compiler_name}:\n")
         output_box.insert("end", " ".join(compile_cmd) + "\n\n")
 
@@ -1285,45 +4443,75 @@ def run_code():
 
     app.after(10, lambda: None)  # small yield
 
+    def stream_output(batch):
+        app.after(0, lambda: show_compiler_output(batch))
+
     def compile_and_run():
+        nonlocal output_exe
         try:
-            result = subprocess.run(
-                compile_cmd,
-                capture_output=True,
-                text=True,
-                cwd=os.path.dirname(source_file),
-                env=mingw_env,
-                creationflags=subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0
-            )
-            app.after(0, lambda: update_compile_result(result))
+            output_exe, report = build_executable(tab, source_file, output_exe, compile_flags, stream_output)
+            if report[0] == "cached":
+                app.after(0, lambda: update_cache_hit(*report[1:]))
+            else:
+                app.after(0, lambda: update_compile_result(*report[1:]))
         except Exception as e:
-            app.after(0, lambda: update_compile_error(e))
+            app.after(0, lambda e=e: update_compile_error(e))
 
-    def update_compile_result(result):
+    def update_compile_result(result, compile_time, notes):
         output_box.configure(state="normal")
+        errors = diagnostic_counts.get("error", 0)
+        warnings = diagnostic_counts.get("warning", 0)
         if result.returncode != 0:
-            output_box.insert("end", "❌ COMPILATION FAILED\n\n")
-            output_box.insert("end", result.stderr or "Unknown error\n")
+            # The compiler output itself was already streamed above
+            output_box.insert("end", f"\n❌ COMPILATION FAILED ({errors} errors, {warnings} warnings)\n")
+            if not result.stderr:
+                output_box.insert("end", "Unknown error\n")
             output_box.insert("end", f"\nReturn code: {result.returncode}\n")
         else:
-            output_box.insert("end", "✓ Compilation successful\n\n")
+            if warnings:
+                notes = notes + [f"{warnings} warnings"]
+            details = "".join(", " + note for note in notes)
+            output_box.insert("end", f"✓ Compilation successful ({compile_time:.2f} s{details})\n\n")
         output_box.configure(state="disabled")
 
         if result.returncode == 0:
             run_program()
 
+    def update_cache_hit(cached_time, lookup_time, attached):
+        output_box.configure(state="normal")
+        source = "Background build finished" if attached else "Build cache hit"
+        if cached_time is None:
+            output_box.insert("end", f"⚡ {source}, compilation skipped\n\n")
+        else:
+            saved = max(0.0, cached_time - lookup_time)
+            output_box.insert("end", f"⚡ {source}, compilation skipped (saved {saved:.2f} s)\n\n")
+        output_box.configure(state="disabled")
+        run_program()
+
     def update_compile_error(e):
         output_box.configure(state="normal")
         output_box.insert("end", f"\n❌ Error: {e}\n")
         output_box.configure(state="disabled")
 
     def run_program():
-        code_content = tab["content"].lower()
+        code_content = get_tab_content(tab).lower()
         uses_input = any(keyword in code_content for keyword in [
             'cin', 'scanf', 'getline', 'getchar', 'gets'
         ])
+        input_source = current_input_source()
+        if input_source and input_source[0] == "file" and not os.path.isfile(input_source[1]):
+            messagebox.showerror("Input File", f"Input file not found:\n{input_source[1] or '(none selected)'}")
+            return
+
+        external = settings.get("use_external_terminal", False) or (uses_input and input_source is None)
+        if external and platform.system() != "Windows":
+            # cmd /k only exists on Windows: run in the panel with no input instead
+            app.after(0, lambda: output_box.configure(state="normal"))
+            app.after(0, lambda: output_box.insert("end", "⚠️ External terminal is only available on Windows, running in the output panel\n"))
+            app.after(0, lambda: output_box.configure(state="disabled"))
+            external = False
 
-        if settings.get("use_external_terminal", False) or uses_input:
+        if external:
             app.after(0, lambda: output_box.configure(state="normal"))
             msg = "⚠️ Program requires input - launching in external terminal...\n" if uses_input and not settings.get("use_external_terminal") else "Launching in external terminal...\n"
             app.after(0, lambda: output_box.insert("end", msg))
@@ -1348,45 +4536,66 @@ def run_code():
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
             cwd=os.path.dirname(source_file),
-            env=mingw_env,
-            bufsize=1
+            env=mingw_env
         )
+        start_stdin_writer(process, input_source)
+        start_resource_monitor(process)
+        limits = current_run_limits()
 
-        def reader():
-            try:
-                for line in process.stdout:
-                    app.after(0, lambda l=line: update_output(l))
-                process.wait()
-                app.after(0, lambda: finish_output(process.returncode))
-            except Exception as e:
-                app.after(0, lambda: update_output(f"\n❌ Error: {e}\n"))
-
-        def update_output(text):
+        def finish_output(usage):
             output_box.configure(state="normal")
-            output_box.insert("end", text)
+            output_box.insert("end", f"\n{'─' * 60}\nProgram finished (exit code {usage['returncode']})\n")
+            output_box.insert("end", format_usage(usage) + "\n")
+            if usage["limit"] is not None:
+                output_box.insert("end", f"⛔ Stopped: {describe_limit(usage['limit'], limits)}\n")
             output_box.see("end")
             output_box.configure(state="disabled")
-
-        def finish_output(returncode):
-            output_box.configure(state="normal")
-            output_box.insert("end", f"\n{'─' * 60}\nProgram finished (exit code {returncode})\n")
-            output_box.configure(state="disabled")
             global process
             process = None
 
-        threading.Thread(target=reader, daemon=True).start()
+        start_output_pump(process, finish_output, limits)
 
     threading.Thread(target=compile_and_run, daemon=True).start()
 
 
-run_button = ctk.CTkButton(right_frame, text="Run", font=("Arial", 16), command=run_code)
-run_button.pack(padx=10, pady=10, fill="x")
+run_bar = ctk.CTkFrame(right_frame, fg_color="transparent")
+run_bar.pack(padx=10, pady=10, fill="x")
+run_button = ctk.CTkButton(run_bar, text="Run", font=("Arial", 16), command=run_code)
+run_button.pack(side="left", fill="x", expand=True)
+benchmark_button = ctk.CTkButton(run_bar, text="Benchmark", width=100, command=run_benchmark)
+benchmark_button.pack(side="left", padx=(5, 0))
+baseline_button = ctk.CTkButton(run_bar, text="Set Baseline", width=100, state="disabled", command=set_benchmark_baseline)
+baseline_button.pack(side="left", padx=(5, 0))
+
+tests_button = ctk.CTkButton(right_frame, text="Run Tests", command=run_tests)
+tests_button.pack(padx=10, pady=(0, 10), fill="x")
+
+# Input source for in-app runs
+input_bar = ctk.CTkFrame(right_frame, fg_color="transparent")
+input_bar.pack(fill="x", padx=10, pady=(0, 5))
+ctk.CTkLabel(input_bar, text="Input").pack(side="left", padx=(0, 8))
+input_mode_selector = ctk.CTkSegmentedButton(input_bar, values=list(INPUT_MODES), command=set_input_mode)
+input_mode_selector.pack(side="left")
+input_text = ctk.CTkTextbox(right_frame, height=80, font=("Consolas", 12))
+input_file_row = ctk.CTkFrame(right_frame, fg_color="transparent")
+input_file_entry = ctk.CTkEntry(input_file_row, placeholder_text="Input file")
+input_file_entry.pack(side="left", fill="x", expand=True)
+input_file_entry.bind("<FocusOut>", lambda e: settings.update({"input_file": input_file_entry.get().strip()}))
+ctk.CTkButton(input_file_row, text="Browse", width=70, command=browse_input_file).pack(side="left", padx=(5, 0))
+if settings.get("input_file"):
+    input_file_entry.insert(0, settings["input_file"])
 
 output_label = ctk.CTkLabel(right_frame, text="Output")
 output_label.pack(anchor="w", padx=10)
 
+input_mode_selector.set(next(label for label, mode in INPUT_MODES.items() if mode == settings.get("input_mode", "terminal")))
+set_input_mode(input_mode_selector.get())
+
+# Throughput of the running program's output
+output_stats = ctk.CTkLabel(right_frame, text="", height=16, font=("Arial", 11), text_color="gray")
+output_stats.pack(anchor="w", padx=10)
+
 output_box = tk.Text(
     right_frame,
     bg="#111111",
@@ -1397,23 +4606,72 @@ output_box = tk.Text(
 )
 output_box.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
+# Resource monitor for in-app runs
+monitor_frame = ctk.CTkFrame(right_frame, fg_color="transparent")
+monitor_frame.pack(fill="x", padx=10, pady=(0, 10))
+monitor_canvas = tk.Canvas(monitor_frame, height=48, bg=settings["output_bg_color"], highlightthickness=0)
+monitor_canvas.pack(side="left", fill="x", expand=True)
+monitor_export = ctk.CTkButton(monitor_frame, text="Export CSV", width=90, height=24, state="disabled", command=export_monitor_csv)
+monitor_export.pack(side="left", padx=(5, 0))
+
 output_box.configure(
     font=(settings["output_font_family"], settings["output_font_size"]),
     fg=settings["output_text_color"],
     bg=settings["output_bg_color"]
 )
 
+for severity, color in DIAGNOSTIC_COLORS.items():
+    output_box.tag_configure("diag_" + severity, foreground=color)
+output_box.tag_configure("diagnostic", underline=True)
+for verdict, color in TEST_VERDICT_COLORS.items():
+    output_box.tag_configure("verdict_" + verdict, foreground=color)
+output_box.tag_configure("bench_regression", foreground="#ff5555")
+output_box.tag_configure("bench_improvement", foreground="#50fa7b")
+output_box.tag_bind("diagnostic", "<Button-1>", on_diagnostic_click)
+output_box.tag_bind("diagnostic", "<Enter>", lambda e: output_box.configure(cursor="hand2"))
+output_box.tag_bind("diagnostic", "<Leave>", lambda e: output_box.configure(cursor=""))
+
+# Full log viewer (hidden until "Full Log" is pressed)
+log_bar = ctk.CTkFrame(right_frame, fg_color="transparent")
+log_bar.pack(fill="x", padx=10, pady=(0, 5), before=output_box)
+log_toggle = ctk.CTkButton(log_bar, text="Full Log", width=110, height=24, command=toggle_log_view)
+log_toggle.pack(side="left")
+log_search = ctk.CTkEntry(log_bar, placeholder_text="Search log (Enter: next)", height=24)
+log_search.bind("<KeyRelease>", lambda e: None if e.keysym == "Return" else search_log())
+log_search.bind("<Return>", lambda e: search_log(next_match=True))
+
+log_frame = tk.Frame(right_frame, bg=settings["output_bg_color"])
+log_frame.grid_rowconfigure(0, weight=1)
+log_frame.grid_columnconfigure(0, weight=1)
+log_text = tk.Text(
+    log_frame,
+    bg=settings["output_bg_color"],
+    fg=settings["output_text_color"],
+    font=(settings["output_font_family"], settings["output_font_size"]),
+    state="disabled",
+    wrap="none"
+)
+log_text.grid(row=0, column=0, sticky="nsew")
+log_scroll = ctk.CTkScrollbar(log_frame, command=on_log_scroll)
+log_scroll.grid(row=0, column=1, sticky="ns")
+log_text.tag_configure("log_match", background="#44475a")
+log_text.bind("<MouseWheel>", on_log_wheel)
+log_text.bind("<Button-4>", on_log_wheel)
+log_text.bind("<Button-5>", on_log_wheel)
+log_text.bind("<Configure>", lambda e: log_view["visible"] and render_log_page())
+
 
 # Cleanup running child process when app closes
 def on_closing():
     global process
     if process is not None and psutil.pid_exists(process.pid):
-        try:
-            p = psutil.Process(process.pid)
-            p.kill()
-            print(f"Killed child process {process.pid} on app exit")
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            pass
+        kill_process_tree(process.pid)
+        print(f"Killed child process {process.pid} on app exit")
+    for tab in tabs.values():
+        # Edits still inside the auto-save delay would otherwise be lost
+        flush_auto_save(tab, wait=True)
+        cancel_speculative_build(tab["id"])
+        discard_stored_text(tab)
     app.destroy()
 
 app.protocol("WM_DELETE_WINDOW", on_closing)